@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
 
 from . import mocks
+from .cache import FileCache, MemoryCache, default_cache_dir
 from .cost_analyzer import CostAnalyzer, get_global_analyzer
-from .llm import LLMClient
 from .schemas import validate_schema
 from .tools import market_snapshot, fundamentals_events
-from .tools.sentiment_analysis import sentiment_analysis
+from .tools.fundamentals_events import FUNDAMENTALS_EVENTS_INPUT_SCHEMA, FUNDAMENTALS_EVENTS_OUTPUT_SCHEMA
+from .tools.market_snapshot import MARKET_SNAPSHOT_INPUT_SCHEMA, MARKET_SNAPSHOT_OUTPUT_SCHEMA
+from .tools.sentiment_analysis import (
+    SENTIMENT_ANALYSIS_OUTPUT_SCHEMA,
+    SENTIMENT_ANALYSIS_SCHEMA,
+    sentiment_analysis,
+)
 from .tools.providers import YFinanceProvider
 from .tools.registry import Tool, ToolRegistry
 
+if TYPE_CHECKING:
+    from .llm import LLMClient
+
 
 def _safe_output(query: str, tickers: List[str]) -> Dict[str, Any]:
     return {
@@ -30,63 +45,229 @@ def _safe_output(query: str, tickers: List[str]) -> Dict[str, Any]:
     }
 
 
-def _json_safe(value: Any) -> Any:
+@lru_cache(maxsize=4096)
+def _normalize_ticker(ticker: str) -> str:
+    """Uppercase and intern a ticker so repeated symbols share one string."""
+    return sys.intern(ticker.upper())
+
+
+def _dedupe_tickers(tickers: Iterable[str], limit: Optional[int] = None) -> List[str]:
+    """Normalize tickers, dropping blanks and repeats in first-seen order."""
+    unique = dict.fromkeys(_normalize_ticker(t) for t in tickers if t)
+    return list(islice(unique, limit))
+
+
+# Default arguments per tool
+_TOOL_ARG_BUILDERS: Dict[str, Callable[[str, str], Dict[str, Any]]] = {
+    "market_snapshot": lambda ticker, period: {
+        "ticker": ticker, "period": period, "interval": "1d", "benchmarks": [],
+    },
+    "fundamentals_events": lambda ticker, period: {
+        "ticker": ticker, "fields": [], "include_calendar": True, "lookback_days": 90,
+    },
+    "sentiment_analysis": lambda ticker, period: {"ticker": ticker, "lookback_days": 30},
+}
+
+# Invocations per tool call: the first try plus one retry on a raised error
+_TOOL_ATTEMPTS = 2
+
+_ALLOWED_PERIODS: FrozenSet[str] = frozenset({"1mo", "3mo", "6mo", "1y"})
+_PROXY_TICKERS: Tuple[str, ...] = ("SPY", "QQQ", "TLT", "GLD")
+
+# Plausible Yahoo symbols: equities/ETFs (BRK.B, BF-B), indices (^GSPC),
+# futures (GC=F) and crypto pairs (BTC-USD)
+_TICKER_RE = re.compile(r"^\^?[A-Z0-9]{1,6}(?:[.\-=][A-Z0-9]{1,4})?$")
+
+# Tickers confirmed to exist, shared across agents (thread-safe LRU). Only
+# positive results are kept so transient lookup failures are re-probed, and
+# entries expire so a delisted symbol is eventually probed again.
+_VALIDATED_TICKERS_MAX = 1024
+_VALIDATED_TICKERS_TTL_SECONDS = 24 * 60 * 60
+_VALIDATED_TICKERS = MemoryCache(_VALIDATED_TICKERS_MAX, _VALIDATED_TICKERS_TTL_SECONDS)
+
+
+HIGH_VOLATILITY_PCT = 40.0
+LARGE_DRAWDOWN_PCT = -20.0
+
+
+def _risk_flags(volatility_ann_pct: float, max_drawdown_pct: float) -> Tuple[bool, bool]:
+    """Return (high_volatility, large_drawdown) flags for snapshot metrics."""
+    return volatility_ann_pct >= HIGH_VOLATILITY_PCT, max_drawdown_pct <= LARGE_DRAWDOWN_PCT
+
+
+def _contains_temporal(value: Any) -> bool:
+    # Explicit stack: stops at the first date without recursing per node
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, (datetime, date)):
+            return True
+    return False
+
+
+def _json_safe_leaf(value: Any) -> Any:
     if isinstance(value, dict):
-        return {key: _json_safe(val) for key, val in value.items()}
+        return {}
     if isinstance(value, list):
-        return [_json_safe(item) for item in value]
+        return []
     if isinstance(value, (datetime, date)):
         return value.isoformat()
     return value
 
 
+def _json_safe_copy(value: Any) -> Any:
+    root = _json_safe_leaf(value)
+    # (source, copy) containers still to fill; children are attached empty
+    # and queued, so list order is preserved by appending in source order
+    stack = [(value, root)] if isinstance(value, (dict, list)) else []
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, val in source.items():
+                target[key] = child = _json_safe_leaf(val)
+                if isinstance(val, (dict, list)):
+                    stack.append((val, child))
+        else:
+            for val in source:
+                child = _json_safe_leaf(val)
+                target.append(child)
+                if isinstance(val, (dict, list)):
+                    stack.append((val, child))
+    return root
+
+
+def _json_safe(value: Any) -> Any:
+    # Tool payloads rarely carry dates; return them untouched instead of copying
+    if not _contains_temporal(value):
+        return value
+    return _json_safe_copy(value)
+
+
+@dataclass(slots=True)
+class TickerResult:
+    """Tool payloads collected for one ticker during a run."""
+
+    ticker: str
+    tool_returns: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    snapshot: Optional[Dict[str, Any]] = None
+    fundamentals_events: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class ProcessedResults:
+    """Output sections derived from a run's per-ticker results."""
+
+    snapshots: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    fundamentals: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    tool_returns: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    thesis_bullets: List[str] = field(default_factory=list)
+    risks: List[str] = field(default_factory=list)
+    # (tool_name, ticker) pairs, rendered to "tool:ticker" strings only for the output
+    data_used: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PendingRun:
+    """A researched query whose tool calls are done and whose summary is not yet merged."""
+
+    query: str
+    period: str
+    tickers: List[str]
+    tickers_for_calls: List[str]
+    output: Dict[str, Any]
+    tool_calls: List[Dict[str, Any]]
+    processed: ProcessedResults
+
+
 class ResearchAgent:
-    def __init__(self, offline: bool = False, use_llm: bool = True, track_costs: bool = True, available_tools: Optional[List[str]] = None) -> None:
+    __slots__ = (
+        "offline",
+        "use_llm",
+        "llm",
+        "track_costs",
+        "max_tool_calls",
+        "max_tickers",
+        "max_tool_workers",
+        "allowed_periods",
+        "proxy_tickers",
+        "provider",
+        "cache",
+        "_tool_dispatch",
+        "_full_registry",
+        "registry",
+        "_tools_description",
+        "_tool_names",
+        "_tools_by_name",
+        "__weakref__",
+    )
+
+    # Full tool registry is immutable, so it is built once and shared by all agents
+    _FULL_REGISTRY: Optional[ToolRegistry] = None
+
+    def __init__(
+        self,
+        offline: bool = False,
+        use_llm: bool = True,
+        track_costs: bool = True,
+        available_tools: Optional[List[str]] = None,
+        use_cache: bool = False,
+    ) -> None:
         self.offline = offline
         self.use_llm = use_llm and not offline
-        self.llm = LLMClient() if self.use_llm else None
+        self.llm: Optional[LLMClient] = None
+        if self.use_llm:
+            # Deferred: the LLM SDKs are slow to import and unused offline
+            from .llm import LLMClient
+
+            self.llm = LLMClient()
         self.track_costs = track_costs and self.use_llm
         self.max_tool_calls = 6
         self.max_tickers = 5
-        self.allowed_periods = {"1mo", "3mo", "6mo", "1y"}
-        self.proxy_tickers = ["SPY", "QQQ", "TLT", "GLD"]
+        self.max_tool_workers = 8
+        self.allowed_periods = _ALLOWED_PERIODS
+        self.proxy_tickers = _PROXY_TICKERS
         self.provider = YFinanceProvider()
-        
-        # Initialize full registry first
-        self._full_registry = self._initialize_tool_registry()
+        # Opt-in: live tool payloads are cached on disk; offline mocks are already local
+        self.cache = FileCache(default_cache_dir()) if use_cache and not offline else None
+        # Shared full registry (built on first use)
+        self._full_registry = self._get_full_registry()
+        # Resolve tool callables once from the registry handlers; offline runs
+        # bind the mock of the same name instead
+        self._tool_dispatch: Dict[str, Callable[..., Dict[str, Any]]] = {
+            name: getattr(mocks, name) if offline else tool.handler
+            for name, tool in self._full_registry.get_all().items()
+        }
         
         # Filter to available tools (default to free-tier tools only)
         self.registry = self._get_available_tools_registry(available_tools)
+        # Built once so every LLM prompt carries an identical, cacheable prefix
+        self._tools_description = self.registry.to_prompt_description()
+        # The filtered registry is fixed after construction; snapshot its lookups
+        self._tool_names: Tuple[str, ...] = tuple(self.registry.list_names())
+        self._tools_by_name: Dict[str, Tool] = dict(self.registry.get_all())
 
-    def _initialize_tool_registry(self) -> ToolRegistry:
-        """Initialize and return the tool registry with market_snapshot and fundamentals_events."""
+    @classmethod
+    def _get_full_registry(cls) -> ToolRegistry:
+        """Return the shared full tool registry, building it on first use."""
+        if cls._FULL_REGISTRY is None:
+            cls._FULL_REGISTRY = cls._initialize_tool_registry()
+        return cls._FULL_REGISTRY
+
+    @staticmethod
+    def _initialize_tool_registry() -> ToolRegistry:
+        """Initialize and return the tool registry with all known tools."""
         registry = ToolRegistry()
         
         # Define market_snapshot tool
         market_snapshot_tool = Tool(
             name="market_snapshot",
             handler=market_snapshot,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "ticker": {"type": "string"},
-                    "period": {"type": "string"},
-                    "interval": {"type": "string"},
-                    "benchmarks": {"type": "array"},
-                },
-                "required": ["ticker", "period"],
-            },
-            output_schema={
-                "type": "object",
-                "properties": {
-                    "ticker": {"type": "string"},
-                    "period": {"type": "string"},
-                    "prices": {"type": "object"},
-                    "trend": {"type": "object"},
-                    "risk": {"type": "object"},
-                    "volume": {"type": "object"},
-                },
-            },
+            input_schema=MARKET_SNAPSHOT_INPUT_SCHEMA,
+            output_schema=MARKET_SNAPSHOT_OUTPUT_SCHEMA,
             description="Fetch technical analysis metrics (returns, volatility, trend, drawdowns, volume z-score, ATR, SMA)",
             usage_examples=[
                 "What's the 1-year trend for NVDA?",
@@ -101,24 +282,8 @@ class ResearchAgent:
         fundamentals_tool = Tool(
             name="fundamentals_events",
             handler=fundamentals_events,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "ticker": {"type": "string"},
-                    "fields": {"type": "array"},
-                    "include_calendar": {"type": "boolean"},
-                    "lookback_days": {"type": "integer"},
-                },
-                "required": ["ticker"],
-            },
-            output_schema={
-                "type": "object",
-                "properties": {
-                    "ticker": {"type": "string"},
-                    "fundamentals": {"type": "object"},
-                    "calendar": {"type": "array"},
-                },
-            },
+            input_schema=FUNDAMENTALS_EVENTS_INPUT_SCHEMA,
+            output_schema=FUNDAMENTALS_EVENTS_OUTPUT_SCHEMA,
             description="Fetch company fundamentals (P/E, EPS, market cap, dividend, etc.) and upcoming earnings calendar",
             usage_examples=[
                 "What's NVDA's P/E ratio and earnings next quarter?",
@@ -130,7 +295,6 @@ class ResearchAgent:
         registry.register(fundamentals_tool)
         
         # Define sentiment_analysis tool (paid)
-        from .tools.sentiment_analysis import SENTIMENT_ANALYSIS_SCHEMA, SENTIMENT_ANALYSIS_OUTPUT_SCHEMA
         sentiment_tool = Tool(
             name="sentiment_analysis",
             handler=sentiment_analysis,
@@ -180,15 +344,48 @@ class ResearchAgent:
             ]
             return self._full_registry.create_filtered_registry(free_tools)
 
+    def _safe_get_info(self, ticker: str) -> Dict[str, Any]:
+        try:
+            return self.provider.get_info(ticker) or {}
+        except Exception:
+            return {}
+
+    def _probe_tickers(self, tickers: List[str]) -> Dict[str, bool]:
+        """Check which tickers exist, preferring one batched provider request."""
+        get_quotes_batch = getattr(self.provider, "get_quotes_batch", None)
+        if get_quotes_batch is not None:
+            try:
+                quotes = get_quotes_batch(tickers)
+                return {ticker: bool(quotes.get(ticker)) for ticker in tickers}
+            except Exception:
+                pass
+        # No batch support (or it failed): probes are independent, run them concurrently
+        if len(tickers) == 1:
+            infos = [self._safe_get_info(tickers[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_tool_workers, len(tickers))) as executor:
+                infos = list(executor.map(self._safe_get_info, tickers))
+        return {ticker: bool(info) for ticker, info in zip(tickers, infos)}
+
     def _validate_tickers(self, tickers: List[str]) -> Tuple[List[str], List[str]]:
+        # Malformed symbols (e.g. hallucinated company names) never reach the network
+        # One lookup per ticker: a concurrent eviction cannot split check and use
+        known = {ticker for ticker in tickers if _VALIDATED_TICKERS.get(ticker)}
+        to_probe = [
+            ticker for ticker in tickers
+            if ticker not in known and _TICKER_RE.match(ticker)
+        ]
+        found: Dict[str, bool] = {}
+        if to_probe:
+            found = self._probe_tickers(to_probe)
+
         valid: List[str] = []
         invalid: List[str] = []
         for ticker in tickers:
-            try:
-                info = self.provider.get_info(ticker)
-            except Exception:
-                info = {}
-            if info:
+            if ticker in known:
+                valid.append(ticker)
+            elif found.get(ticker):
+                _VALIDATED_TICKERS.set(ticker, True)
                 valid.append(ticker)
             else:
                 invalid.append(ticker)
@@ -201,19 +398,39 @@ class ResearchAgent:
         period: str,
         tool_calls: List[Dict[str, Any]],
         limitations: List[str],
-    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        planned_tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, TickerResult]:
         """Let LLM decide which tools to call and execute them.
         
+        Args:
+            planned_tools: Tool decisions already returned by ``plan_research``;
+                reused instead of a separate ``decide_tools`` call when they
+                still apply to ``tickers``
+        
         Returns:
-            (snapshots, fundamentals_by_ticker, tool_returns)
+            Per-ticker results keyed by ticker, in first-call order
         """
-        snapshots: Dict[str, Dict[str, Any]] = {}
-        fundamentals_by_ticker: Dict[str, Dict[str, Any]] = {}
-        tool_returns: Dict[str, Dict[str, Any]] = {}
-        
-        # Get LLM tool routing decision
-        tools_description = self.registry.to_prompt_description()
-        tool_decision = self.llm.decide_tools(query, tickers, tools_description) if self.llm else {}
+        # Reuse planned routing for the surviving tickers, else ask the LLM
+        allowed = set(tickers)
+        planned = [
+            {
+                "tool": spec.get("tool"),
+                "tickers": [
+                    _normalize_ticker(t) for t in spec.get("tickers", [])
+                    if isinstance(t, str) and _normalize_ticker(t) in allowed
+                ],
+            }
+            for spec in planned_tools or []
+            if isinstance(spec, dict)
+        ]
+        planned = [spec for spec in planned if spec["tickers"]]
+        if planned:
+            tool_decision = {"tools": planned}
+        elif self._routing_is_trivial(tickers):
+            # Nothing for the router to choose: call every available tool
+            tool_decision = {"tools": [{"tool": name, "tickers": tickers} for name in self._tool_names]}
+        else:
+            tool_decision = self.llm.decide_tools(query, tickers, self._tools_description) if self.llm else {}
         
         if tool_decision.get("llm_error"):
             limitations.append(f"LLM tool routing failed: {tool_decision['llm_error']}")
@@ -225,54 +442,94 @@ class ResearchAgent:
         else:
             tools_to_call = tool_decision.get("tools", [])
         
-        # Execute tools as decided by LLM
+        # Collect tool calls as decided by LLM, then execute them concurrently
+        jobs: List[Tuple[str, Dict[str, Any]]] = []
         for tool_spec in tools_to_call:
             tool_name = tool_spec.get("tool")
             target_tickers = tool_spec.get("tickers", [])
             
             # Validate tool exists in registry
-            if not self.registry.get(tool_name):
+            if tool_name not in self._tools_by_name:
                 limitations.append(f"Invalid tool requested by LLM: {tool_name}")
                 continue
             
-            # Execute for each ticker
+            build_args = _TOOL_ARG_BUILDERS.get(tool_name)
+            if build_args is None:
+                continue
             for ticker in target_tickers:
-                if tool_name == "market_snapshot":
-                    snapshot = self._call_tool(
-                        "market_snapshot",
-                        {"ticker": ticker, "period": period, "interval": "1d", "benchmarks": []},
-                        tool_calls,
-                        limitations,
-                    )
-                    snapshots[ticker] = snapshot
-                    if ticker not in tool_returns:
-                        tool_returns[ticker] = {}
-                    tool_returns[ticker]["market_snapshot"] = snapshot
-                    
-                elif tool_name == "fundamentals_events":
-                    fundamentals = self._call_tool(
-                        "fundamentals_events",
-                        {"ticker": ticker, "fields": [], "include_calendar": True, "lookback_days": 90},
-                        tool_calls,
-                        limitations,
-                    )
-                    fundamentals_by_ticker[ticker] = fundamentals.get("fundamentals", {})
-                    if ticker not in tool_returns:
-                        tool_returns[ticker] = {}
-                    tool_returns[ticker]["fundamentals_events"] = fundamentals
-                
-                elif tool_name == "sentiment_analysis":
-                    sentiment = self._call_tool(
-                        "sentiment_analysis",
-                        {"ticker": ticker, "lookback_days": 30},
-                        tool_calls,
-                        limitations,
-                    )
-                    if ticker not in tool_returns:
-                        tool_returns[ticker] = {}
-                    tool_returns[ticker]["sentiment_analysis"] = sentiment
+                jobs.append((tool_name, build_args(ticker, period)))
         
-        return snapshots, fundamentals_by_ticker, tool_returns
+        return self._run_tool_jobs(jobs, tool_calls, limitations)
+
+    def _routing_is_trivial(self, tickers: List[str]) -> bool:
+        """True when an LLM routing call could only select every available tool.
+
+        That holds with a single available tool, or a single ticker when every
+        available tool is free (calling all of them costs nothing extra).
+        """
+        if len(self._tool_names) <= 1:
+            return True
+        return len(tickers) == 1 and not any(tool.is_paid for tool in self._tools_by_name.values())
+
+    def _run_tool_jobs(
+        self,
+        jobs: List[Tuple[str, Dict[str, Any]]],
+        tool_calls: List[Dict[str, Any]],
+        limitations: List[str],
+    ) -> Dict[str, TickerResult]:
+        """Execute tool jobs and group their payloads into per-ticker results."""
+        results: Dict[str, TickerResult] = {}
+        payloads = self._call_tools_concurrently(jobs, tool_calls, limitations)
+        for (tool_name, args), payload in zip(jobs, payloads):
+            ticker = args["ticker"]
+            result = results.get(ticker)
+            if result is None:
+                result = results[ticker] = TickerResult(ticker)
+            result.tool_returns[tool_name] = payload
+            if tool_name == "market_snapshot":
+                result.snapshot = payload
+            elif tool_name == "fundamentals_events":
+                result.fundamentals_events = payload
+        return results
+
+    def _call_tools_concurrently(
+        self,
+        jobs: List[Tuple[str, Dict[str, Any]]],
+        tool_calls: List[Dict[str, Any]],
+        limitations: List[str],
+    ) -> List[Dict[str, Any]]:
+        """Execute independent (tool_name, args) calls on a thread pool.
+        
+        Tool calls are I/O-bound, so they run concurrently. Each call records
+        into its own lists, which are merged in submission order so that
+        ``tool_calls`` and ``limitations`` stay deterministic.
+        
+        Returns:
+            Tool payloads in the same order as ``jobs``
+        """
+        if not jobs:
+            return []
+
+        def _invoke(job: Tuple[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]:
+            name, args = job
+            job_calls: List[Dict[str, Any]] = []
+            job_limitations: List[str] = []
+            payload = self._call_tool(name, args, job_calls, job_limitations)
+            return payload, job_calls, job_limitations
+
+        if len(jobs) == 1:
+            # Nothing to overlap; skip thread pool start-up
+            results = [_invoke(jobs[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_tool_workers, len(jobs))) as executor:
+                results = list(executor.map(_invoke, jobs))
+
+        payloads: List[Dict[str, Any]] = []
+        for payload, job_calls, job_limitations in results:
+            tool_calls.extend(job_calls)
+            limitations.extend(job_limitations)
+            payloads.append(payload)
+        return payloads
 
     def _call_tool(
         self,
@@ -282,43 +539,83 @@ class ResearchAgent:
         limitations: List[str],
     ) -> Dict[str, Any]:
         tool_calls.append({"name": name, "args": args})
-        if self.offline:
-            tool_func = getattr(mocks, name)
-        else:
-            if name == "market_snapshot":
-                tool_func = market_snapshot
-            elif name == "fundamentals_events":
-                tool_func = fundamentals_events
-            elif name == "sentiment_analysis":
-                tool_func = sentiment_analysis
-            else:
-                raise ValueError(f"Unknown tool: {name}")
+        tool_func = self._tool_dispatch.get(name)
+        if tool_func is None:
+            raise ValueError(f"Unknown tool: {name}")
 
-        payload = tool_func(**args)
-        ok, error = validate_schema(name, payload)
-        if ok:
-            return payload
+        if self.cache is not None:
+            cached = self.cache.get(name, args)
+            # Entries written before a schema change are refetched, not trusted
+            if cached is not None and validate_schema(name, cached)[0]:
+                limitations.append(f"{name} for {args.get('ticker', '')}: served from on-disk cache")
+                return cached
+
+        # At most one invocation per attempt, and only a raised (e.g. transient
+        # network) error earns a retry; an invalid payload from the same args
+        # would just be invalid again, so it is never re-fetched
+        for attempt in range(_TOOL_ATTEMPTS):
+            try:
+                payload = tool_func(**args)
+                break
+            except Exception as exc:
+                if attempt + 1 == _TOOL_ATTEMPTS:
+                    limitations.append(f"{name} failed: {exc}")
+                    return {"error": "TOOL_ERROR", "ticker": args.get("ticker", ""), "reason": str(exc) or "exception"}
 
-        payload = tool_func(**args)
         ok, error = validate_schema(name, payload)
         if ok:
+            if self.cache is not None and "error" not in payload:
+                self.cache.set(name, args, payload)
             return payload
 
         limitations.append(f"{name} output invalid: {error}")
         return {"error": "INVALID_OUTPUT", "ticker": args.get("ticker", ""), "reason": error or "schema"}
 
+    def _fallback_jobs(self, tickers: List[str], period: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Every available tool for every ticker, ticker-major; tools without arg builders are skipped."""
+        builders = [
+            (tool_name, _TOOL_ARG_BUILDERS[tool_name])
+            for tool_name in self._tool_names
+            if tool_name in _TOOL_ARG_BUILDERS
+        ]
+        return [(tool_name, build_args(ticker, period)) for ticker in tickers for tool_name, build_args in builders]
+
+    def _post_process(self, results: Dict[str, TickerResult], limitations: List[str]) -> ProcessedResults:
+        """Derive every output section from the per-ticker results in a single pass."""
+        processed = ProcessedResults()
+        for result in results.values():
+            ticker = result.ticker
+            processed.tool_returns[ticker] = result.tool_returns
+            processed.data_used.extend((tool_name, ticker) for tool_name in result.tool_returns)
+
+            if result.snapshot is not None:
+                processed.snapshots[ticker] = result.snapshot
+                thesis, risk = self._summarize_snapshot(ticker, result.snapshot)
+                processed.thesis_bullets.append(thesis)
+                if risk:
+                    processed.risks.append(risk)
+
+            if result.fundamentals_events is not None:
+                processed.fundamentals[ticker] = result.fundamentals_events.get("fundamentals", {})
+                if "error" in result.fundamentals_events:
+                    limitations.append(f"{ticker}: fundamentals unavailable")
+        return processed
+
     def _summarize_snapshot(self, ticker: str, snapshot: Dict[str, Any]) -> Tuple[str, Optional[str]]:
         if "error" in snapshot:
             return f"{ticker}: snapshot unavailable", "Data unavailable"
         trend = snapshot["trend"]["trend_label"]
         ret = snapshot["prices"]["return_pct"]
         vol = snapshot["risk"]["volatility_ann_pct"]
+        max_dd = snapshot["prices"]["max_drawdown_pct"]
         thesis = f"{ticker}: {trend} trend, return {ret:.2f}% over {snapshot['period']}"
+        high_vol, large_dd = _risk_flags(vol, max_dd)
         risk = None
-        if vol >= 40.0:
+        # Drawdown takes precedence over volatility when both are flagged
+        if large_dd:
+            risk = f"{ticker}: large drawdown ({max_dd:.1f}%)"
+        elif high_vol:
             risk = f"{ticker}: high volatility ({vol:.1f}%)"
-        if snapshot["prices"]["max_drawdown_pct"] <= -20.0:
-            risk = f"{ticker}: large drawdown ({snapshot['prices']['max_drawdown_pct']:.1f}%)"
         return thesis, risk
 
     def _llm_summarize(
@@ -327,32 +624,120 @@ class ResearchAgent:
         tickers: List[str],
         snapshots: Dict[str, Dict[str, Any]],
         fundamentals: Dict[str, Dict[str, Any]],
+        on_summary_item: Optional[Callable[[str, str], None]] = None,
     ) -> Dict[str, Any]:
         """Use LLM to generate summary from tool outputs."""
         if not self.llm or not self.llm.enabled:
             return {"thesis_bullets": [], "risks": []}
         tool_outputs = {"snapshots": snapshots, "fundamentals": fundamentals}
-        return self.llm.generate_summary(query, tickers, tool_outputs)
+        return self.llm.generate_summary(query, tickers, tool_outputs, on_item=on_summary_item)
+
+    def _precheck(
+        self, query: str, tickers: Optional[List[str]], period: str
+    ) -> Tuple[List[str], str, List[str], Optional[Dict[str, Any]]]:
+        """Apply the cheap input guards before any LLM or network work.
+
+        Returns:
+            (tickers, period, limitations, early_output); ``early_output`` is a
+            finished response when there is nothing to research
+        """
+        limitations: List[str] = []
+        if period not in self.allowed_periods:
+            limitations.append("Invalid period provided. Using default 3mo.")
+            period = "3mo"
+
+        tickers = _dedupe_tickers(tickers or [])
+        if len(tickers) > self.max_tickers:
+            limitations.append("Too many tickers provided. Truncating to max allowed.")
+            tickers = tickers[: self.max_tickers]
 
-    def run(self, query: str, tickers: Optional[List[str]] = None, period: str = "3mo") -> Dict[str, Any]:
-        tickers = [t.upper() for t in (tickers or []) if t]
+        if not tickers and not (query or "").strip():
+            output = _safe_output(query, tickers)
+            output["tickers_source"] = "proxy"
+            output["tickers_inferred"] = []
+            output["limitations"].extend(limitations)
+            output["limitations"].append("Empty query and no tickers provided. Nothing to research.")
+            return tickers, period, limitations, output
+        return tickers, period, limitations, None
+
+    def run(
+        self,
+        query: str,
+        tickers: Optional[List[str]] = None,
+        period: str = "3mo",
+        on_summary_item: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Research ``query`` and return the final output dict.
+
+        ``on_summary_item(field, text)`` is called for each LLM thesis bullet
+        or risk as it streams in; the returned output holds the full summary.
+        """
+        tickers, period, limitations, early_output = self._precheck(query, tickers, period)
+        if early_output is not None:
+            return early_output
+        pending = self._research(query, tickers, period, limitations)
+        llm_summary = None
+        if self.llm and self.llm.enabled:
+            processed = pending.processed
+            llm_summary = self._llm_summarize(
+                query, pending.tickers_for_calls, processed.snapshots, processed.fundamentals, on_summary_item
+            )
+        return self._finish(pending, llm_summary)
+
+    def run_batch(
+        self,
+        requests: Iterable[Mapping[str, Any]],
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Research many queries, summarizing them together through the LLM Batch API.
+
+        Each request holds ``run`` keyword arguments (``query``, optional
+        ``tickers`` and ``period``). Tool calls run per request as in ``run``;
+        the summaries are then submitted as one batch, which bills at half
+        price but may take hours, so this suits offline workloads. Outputs are
+        returned in request order.
+        """
+        outputs: List[Optional[Dict[str, Any]]] = []
+        pending_runs: List[Tuple[int, PendingRun]] = []
+        for request in requests:
+            query = request["query"]
+            tickers, period, limitations, early_output = self._precheck(
+                query, request.get("tickers"), request.get("period", "3mo")
+            )
+            if early_output is None:
+                pending_runs.append((len(outputs), self._research(query, tickers, period, limitations)))
+            outputs.append(early_output)
+
+        summaries: List[Optional[Dict[str, Any]]] = [None] * len(pending_runs)
+        if pending_runs and self.llm and self.llm.enabled:
+            jobs = [
+                (
+                    pending.query,
+                    pending.tickers_for_calls,
+                    {"snapshots": pending.processed.snapshots, "fundamentals": pending.processed.fundamentals},
+                )
+                for _, pending in pending_runs
+            ]
+            summaries = self.llm.generate_summary_batch(jobs, poll_interval=poll_interval, timeout=timeout)
+        for (index, pending), llm_summary in zip(pending_runs, summaries):
+            outputs[index] = self._finish(pending, llm_summary)
+        return outputs
+
+    def _research(
+        self, query: str, tickers: List[str], period: str, limitations: List[str]
+    ) -> PendingRun:
+        """Resolve tickers and run the tool calls; the LLM summary is left to the caller."""
         tickers_source = "explicit" if tickers else "proxy"
         tickers_inferred: List[str] = []
-        limitations: List[str] = []
+        planned_tools: List[Dict[str, Any]] = []
 
         if not tickers:
             if self.use_llm and self.llm and self.llm.enabled and not self.offline:
-                inference = self.llm.infer_tickers(query)
-                inferred_raw = [t.upper() for t in inference.get("tickers", []) if t]
-                seen = set()
-                tickers_inferred = []
-                for ticker in inferred_raw:
-                    if ticker in seen:
-                        continue
-                    tickers_inferred.append(ticker)
-                    seen.add(ticker)
-                    if len(tickers_inferred) >= self.max_tickers:
-                        break
+                # One batched call infers tickers and routes tools
+                inference = self.llm.plan_research(query, self._tools_description)
+                planned_tools = inference.get("tools", [])
+                tickers_inferred = _dedupe_tickers(inference.get("tickers", []), self.max_tickers)
                 if inference.get("llm_error"):
                     limitations.append(f"LLM ticker inference failed: {inference['llm_error']}")
                 valid, invalid = self._validate_tickers(tickers_inferred)
@@ -372,14 +757,6 @@ class ResearchAgent:
                 tickers_source = "proxy"
                 limitations.append("No tickers provided. Using proxy tickers.")
 
-        if len(tickers) > self.max_tickers:
-            limitations.append("Too many tickers provided. Truncating to max allowed.")
-            tickers = tickers[: self.max_tickers]
-
-        if period not in self.allowed_periods:
-            limitations.append("Invalid period provided. Using default 3mo.")
-            period = "3mo"
-
         output = _safe_output(query, tickers)
         output["tickers_source"] = tickers_source
         output["tickers_inferred"] = tickers_inferred
@@ -390,6 +767,8 @@ class ResearchAgent:
                 "LLM disabled: missing API key or client unavailable."
             )
 
+        # Two tool calls (snapshot + fundamentals) are budgeted per ticker; read
+        # per run so callers may change max_tool_calls after construction
         max_tickers_for_budget = self.max_tool_calls // 2
         tickers_for_calls = tickers
         if len(tickers) > max_tickers_for_budget:
@@ -397,86 +776,28 @@ class ResearchAgent:
             tickers_for_calls = tickers[:max_tickers_for_budget]
 
         tool_calls: List[Dict[str, Any]] = []
-        data_used: List[str] = []
-        thesis_bullets: List[str] = []
-        risks: List[str] = []
-        snapshots: Dict[str, Dict[str, Any]] = {}
-        fundamentals_by_ticker: Dict[str, Dict[str, Any]] = {}
-        tool_returns: Dict[str, Dict[str, Any]] = {}
 
         # Use LLM-driven tool routing or fallback pipeline
         if self.use_llm and self.llm and self.llm.enabled:
-            snapshots, fundamentals_by_ticker, tool_returns = self._decide_and_call_tools_llm(
-                query, tickers_for_calls, period, tool_calls, output["limitations"]
+            results = self._decide_and_call_tools_llm(
+                query, tickers_for_calls, period, tool_calls, output["limitations"], planned_tools
             )
-            # Update data_used from tool_returns
-            for ticker, tools_dict in tool_returns.items():
-                for tool_name in tools_dict.keys():
-                    data_used.append(f"{tool_name}:{ticker}")
-            
-            # Generate thesis/risks from snapshots
-            for ticker in snapshots:
-                thesis, risk = self._summarize_snapshot(ticker, snapshots[ticker])
-                thesis_bullets.append(thesis)
-                if risk:
-                    risks.append(risk)
-            
-            # Check for fundamentals errors
-            for ticker, tools_dict in tool_returns.items():
-                if "fundamentals_events" in tools_dict:
-                    fundamentals = tools_dict["fundamentals_events"]
-                    if "error" in fundamentals:
-                        output["limitations"].append(f"{ticker}: fundamentals unavailable")
         else:
             # Fallback pipeline: call all available tools for all tickers
-            for ticker in tickers_for_calls:
-                tool_names = self.registry.list_names()
-                
-                for tool_name in tool_names:
-                    tool_obj = self.registry.get(tool_name)
-                    if not tool_obj:
-                        continue
-                    
-                    # Build args based on tool name
-                    if tool_name == "market_snapshot":
-                        args = {"ticker": ticker, "period": period, "interval": "1d", "benchmarks": []}
-                    elif tool_name == "fundamentals_events":
-                        args = {"ticker": ticker, "fields": [], "include_calendar": True, "lookback_days": 90}
-                    elif tool_name == "sentiment_analysis":
-                        args = {"ticker": ticker, "lookback_days": 30}
-                    else:
-                        # Skip unknown tools
-                        continue
-                    
-                    result = self._call_tool(tool_name, args, tool_calls, output["limitations"])
-                    
-                    data_used.append(f"{tool_name}:{ticker}")
-                    
-                    # Store results by tool type
-                    if tool_name == "market_snapshot":
-                        snapshots[ticker] = result
-                    elif tool_name == "fundamentals_events":
-                        fundamentals_by_ticker[ticker] = result.get("fundamentals", {})
-                    
-                    if ticker not in tool_returns:
-                        tool_returns[ticker] = {}
-                    tool_returns[ticker][tool_name] = result
-                
-                # Generate thesis/risks from snapshots if available
-                if ticker in snapshots:
-                    thesis, risk = self._summarize_snapshot(ticker, snapshots[ticker])
-                    thesis_bullets.append(thesis)
-                    if risk:
-                        risks.append(risk)
-                
-                # Check for fundamentals errors
-                if ticker in tool_returns and "fundamentals_events" in tool_returns[ticker]:
-                    fundamentals = tool_returns[ticker]["fundamentals_events"]
-                    if "error" in fundamentals:
-                        output["limitations"].append(f"{ticker}: fundamentals unavailable")
+            jobs = self._fallback_jobs(tickers_for_calls, period)
+            results = self._run_tool_jobs(jobs, tool_calls, output["limitations"])
 
-        if self.llm and self.llm.enabled:
-            llm_summary = self._llm_summarize(query, tickers_for_calls, snapshots, fundamentals_by_ticker)
+        processed = self._post_process(results, output["limitations"])
+        return PendingRun(query, period, tickers, tickers_for_calls, output, tool_calls, processed)
+
+    def _finish(self, pending: PendingRun, llm_summary: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge an optional LLM summary into a researched run and validate the output."""
+        output = pending.output
+        processed = pending.processed
+        thesis_bullets = processed.thesis_bullets
+        risks = processed.risks
+
+        if llm_summary is not None:
             if llm_summary.get("thesis_bullets"):
                 thesis_bullets = llm_summary["thesis_bullets"]
             if llm_summary.get("risks"):
@@ -484,31 +805,32 @@ class ResearchAgent:
             if llm_summary.get("llm_error"):
                 output["limitations"].append(f"LLM error: {llm_summary['llm_error']}")
             
-            # Track costs if enabled
-            if self.track_costs and llm_summary.get("llm_tokens"):
+            # Track costs if enabled; cache hits made no billed request
+            if self.track_costs and llm_summary.get("llm_tokens") and not llm_summary.get("llm_cached"):
                 analyzer = get_global_analyzer()
                 analysis = analyzer.track_query(
-                    query=query,
-                    tickers=tickers_for_calls,
-                    period=period,
+                    query=pending.query,
+                    tickers=pending.tickers_for_calls,
+                    period=pending.period,
                     provider=llm_summary.get("llm_provider", "unknown"),
                     model=llm_summary.get("llm_model", "unknown"),
                     input_tokens=llm_summary["llm_tokens"].get("input", 0),
                     output_tokens=llm_summary["llm_tokens"].get("output", 0),
+                    cached_input_tokens=llm_summary["llm_tokens"].get("cached_input", 0),
                 )
                 output["cost_analysis"] = analysis.to_dict()
 
         output["summary"] = {"thesis_bullets": thesis_bullets, "risks": risks}
-        output["fundamentals"] = fundamentals_by_ticker
-        output["tool_returns"] = _json_safe(tool_returns)
-        output["data_used"] = data_used
-        output["tool_calls"] = tool_calls
+        output["fundamentals"] = processed.fundamentals
+        output["tool_returns"] = _json_safe(processed.tool_returns)
+        output["data_used"] = [f"{tool_name}:{ticker}" for tool_name, ticker in processed.data_used]
+        output["tool_calls"] = pending.tool_calls
 
         ok, error = validate_schema("final_output", output)
         if not ok:
-            fallback = _safe_output(query, tickers)
-            fallback["tickers_source"] = tickers_source
-            fallback["tickers_inferred"] = tickers_inferred
+            fallback = _safe_output(pending.query, pending.tickers)
+            fallback["tickers_source"] = output["tickers_source"]
+            fallback["tickers_inferred"] = output["tickers_inferred"]
             fallback["limitations"].append(f"Final output invalid: {error}")
             return fallback
 
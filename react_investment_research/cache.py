@@ -0,0 +1,192 @@
+"""Caches: a file-backed TTL cache for tool payloads fetched over the network,
+an in-memory LRU/TTL cache, and a semantic cache for paraphrased LLM queries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Seconds a cached payload stays fresh, per namespace (tool name)
+DEFAULT_TTL_SECONDS: Dict[str, int] = {
+    "market_snapshot": 60 * 60,
+    "fundamentals_events": 24 * 60 * 60,
+    "sentiment_analysis": 6 * 60 * 60,
+}
+
+DEFAULT_CACHE_DIR = ".cache"
+
+# Cosine similarity at or above which two queries count as the same question
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+
+def default_cache_dir() -> Path:
+    """Cache root from RESEARCH_CACHE_DIR, defaulting to ./.cache."""
+    return Path(os.environ.get("RESEARCH_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FileCache:
+    """Store JSON payloads under ``<root>/<namespace>/<sha1(args)>.json``.
+
+    Each entry embeds its write time; reads older than the namespace TTL are
+    treated as misses. Namespaces without a TTL are never cached. Cache I/O
+    is best-effort: any read or write failure behaves like a miss.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        ttl_seconds: Optional[Dict[str, int]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds)
+        self._clock = clock
+
+    def _path(self, namespace: str, args: Dict[str, Any]) -> Path:
+        key = hashlib.sha1(json.dumps(args, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return self.root / namespace / f"{key}.json"
+
+    def get(self, namespace: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for (namespace, args), or None if missing or stale."""
+        ttl = self.ttl_seconds.get(namespace)
+        if not ttl:
+            return None
+        try:
+            with self._path(namespace, args).open("r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if self._clock() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("payload")
+
+    def set(self, namespace: str, args: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        """Store a payload; silently skipped if it cannot be serialized or written."""
+        if not self.ttl_seconds.get(namespace):
+            return
+        path = self._path(namespace, args)
+        try:
+            blob = json.dumps({"ts": self._clock(), "payload": payload}, default=_json_default)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(blob, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            return
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU with per-entry expiry on a monotonic clock."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the stored value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SemanticCache:
+    """Return a stored result when a new query embeds close to a previous one.
+
+    Entries are grouped by namespace (task, model and any non-query inputs
+    such as tickers), so only paraphrases of the same question over the same
+    inputs can match. Lookups are a single matrix-vector product over the
+    unit-normalized embeddings of that namespace; the oldest entry is dropped
+    once a namespace holds ``maxsize``. Embedding failures behave like a miss.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        maxsize: int = 256,
+    ) -> None:
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._embed = embed
+        self._vectors: Dict[Tuple[Any, ...], List[np.ndarray]] = {}
+        self._values: Dict[Tuple[Any, ...], List[Any]] = {}
+        self._matrices: Dict[Tuple[Any, ...], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Unit-normalized embedding of ``text``, or None if it cannot be computed."""
+        try:
+            vector = np.asarray(self._embed(text), dtype=np.float32)
+        except Exception:
+            return None
+        norm = float(np.linalg.norm(vector))
+        if not norm:
+            return None
+        return vector / norm
+
+    def lookup(self, namespace: Tuple[Any, ...], vector: Optional[np.ndarray]) -> Optional[Any]:
+        """Closest stored value in ``namespace`` if it clears the threshold."""
+        if vector is None:
+            return None
+        with self._lock:
+            vectors = self._vectors.get(namespace)
+            if not vectors:
+                return None
+            matrix = self._matrices.get(namespace)
+            if matrix is None:
+                matrix = self._matrices[namespace] = np.vstack(vectors)
+            scores = matrix @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._values[namespace][best]
+
+    def store(self, namespace: Tuple[Any, ...], vector: Optional[np.ndarray], value: Any) -> None:
+        if vector is None or self.maxsize <= 0:
+            return
+        with self._lock:
+            vectors = self._vectors.setdefault(namespace, [])
+            values = self._values.setdefault(namespace, [])
+            vectors.append(vector)
+            values.append(value)
+            if len(vectors) > self.maxsize:
+                del vectors[0], values[0]
+            self._matrices.pop(namespace, None)
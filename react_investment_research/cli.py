@@ -1,7 +1,25 @@
 import argparse
 import json
+import sys
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, TextIO
 
-from .agent import ResearchAgent
+from .server import get_agent
+
+__all__ = ["main", "parse_csv", "write_json"]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_json(payload: Any, stream: Optional[TextIO] = None) -> None:
+    """Stream compact JSON plus a newline without building the whole string first."""
+    stream = sys.stdout if stream is None else stream
+    json.dump(payload, stream, ensure_ascii=True, separators=(",", ":"), default=_json_default)
+    stream.write("\n")
 
 
 def _get_tools_help_text() -> str:
@@ -22,49 +40,91 @@ def _get_tools_help_text() -> str:
     return "\n".join(lines)
 
 
+def parse_csv(value: str) -> List[str]:
+    """Split a comma-separated flag value, stripping each item once and dropping blanks."""
+    return [item for item in map(str.strip, value.split(",")) if item]
+
+
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="ReAct investment research agent")
-    parser.add_argument("--query", required=True)
+    parser.add_argument("--query")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="JSONL file of {\"query\", \"tickers\", \"period\"} requests; summaries go through the "
+        "LLM Batch API (half price, may take hours) and one JSON line is written per request",
+    )
+    parser.add_argument("--batch-poll-seconds", type=float, default=None, help="Seconds between batch status polls")
+    parser.add_argument(
+        "--batch-timeout", type=float, default=None, help="Cancel the LLM batch after this many seconds"
+    )
     parser.add_argument("--tickers", default="")
     parser.add_argument("--period", default="3mo")
     parser.add_argument("--offline", action="store_true")
     parser.add_argument("--use-llm", action="store_true", help="Use LLM for analysis (requires OPENAI_API_KEY or ANTHROPIC_API_KEY)")
     parser.add_argument("--report-cost", action="store_true", help="Include cost analysis in output")
+    parser.add_argument("--cache", action="store_true", help="Reuse live tool results from the on-disk cache")
     parser.add_argument(
         "--tools",
         default=None,
         help=_get_tools_help_text(),
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if (args.query is None) == (args.batch is None):
+        parser.error("exactly one of --query or --batch is required")
+    return args
+
+
+def _read_batch(path: str) -> List[Dict[str, Any]]:
+    """Parse a JSONL batch file into ``ResearchAgent.run`` keyword arguments."""
+    requests = []
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            tickers = entry.get("tickers") or []
+            if isinstance(tickers, str):
+                tickers = parse_csv(tickers)
+            requests.append({
+                "query": entry.get("query", ""),
+                "tickers": [t.upper() for t in tickers],
+                "period": entry.get("period", "3mo"),
+            })
+    return requests
 
 
 def main() -> None:
     args = _parse_args()
-    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    tickers = [t.upper() for t in parse_csv(args.tickers)]
     
     # Parse and validate tools
     available_tools = None
     if args.tools:
-        available_tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+        available_tools = parse_csv(args.tools)
     
     try:
-        agent = ResearchAgent(
+        agent = get_agent(
             offline=args.offline,
             use_llm=args.use_llm,
             track_costs=args.report_cost,
             available_tools=available_tools,
+            use_cache=args.cache,
         )
     except ValueError as e:
         # Tool validation error - error message already includes available tools
-        print(json.dumps({
-            "error": str(e),
-        }, ensure_ascii=True))
+        write_json({"error": str(e)})
         return
     
-    result = agent.run(query=args.query, tickers=tickers, period=args.period)
-    
-    # Remove cost_analysis if not requested
-    if not args.report_cost and "cost_analysis" in result:
-        result["cost_analysis"] = None
-    
-    print(json.dumps(result, ensure_ascii=True))
+    if args.batch is not None:
+        results = agent.run_batch(
+            _read_batch(args.batch), poll_interval=args.batch_poll_seconds, timeout=args.batch_timeout
+        )
+    else:
+        results = [agent.run(query=args.query, tickers=tickers, period=args.period)]
+
+    for result in results:
+        # Remove cost_analysis if not requested
+        if not args.report_cost and "cost_analysis" in result:
+            result["cost_analysis"] = None
+        write_json(result)
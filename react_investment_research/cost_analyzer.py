@@ -3,13 +3,19 @@
 from __future__ import annotations
 
 import json
+import sys
+import threading
+from collections import defaultdict
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+
+import numpy as np
 
 # OpenAI pricing (as of Feb 2026)
 OPENAI_PRICING = {
     "gpt-4o-mini": {
         "input_per_1m": 0.15,  # $0.15 per 1M input tokens
+        "cached_input_per_1m": 0.075,  # prompt-cache hits bill at half price
         "output_per_1m": 0.60,  # $0.60 per 1M output tokens
     },
     "gpt-4-turbo": {
@@ -22,28 +28,72 @@ OPENAI_PRICING = {
 ANTHROPIC_PRICING = {
     "claude-3-5-sonnet-20241022": {
         "input_per_1m": 3.00,  # $3.00 per 1M input tokens
+        "cached_input_per_1m": 0.30,  # prompt-cache reads bill at 10%
         "output_per_1m": 15.00,  # $15.00 per 1M output tokens
     },
+    "claude-3-5-haiku-20241022": {
+        "input_per_1m": 0.80,
+        "cached_input_per_1m": 0.08,
+        "output_per_1m": 4.00,
+    },
     "claude-3-opus-20250219": {
         "input_per_1m": 15.00,
+        "cached_input_per_1m": 1.50,
         "output_per_1m": 75.00,
     },
 }
 
+# Default model per provider when a model has no pricing entry
+DEFAULT_MODELS = {
+    "openai": "gpt-4o-mini",
+    "anthropic": "claude-3-5-sonnet-20241022",
+}
+
+# (input, cached input, output) USD per token keyed by (provider, model),
+# precomputed once so pricing a call is one dict probe and a few multiplies.
+# Models without a cache discount bill cached tokens at the input rate.
+_PER_TOKEN_RATES: Dict[Tuple[str, str], Tuple[float, float, float]] = {
+    (provider, model): (
+        prices["input_per_1m"] / 1_000_000,
+        prices.get("cached_input_per_1m", prices["input_per_1m"]) / 1_000_000,
+        prices["output_per_1m"] / 1_000_000,
+    )
+    for provider, table in (("openai", OPENAI_PRICING), ("anthropic", ANTHROPIC_PRICING))
+    for model, prices in table.items()
+}
+
+# Rates for models without a pricing entry, per provider
+_DEFAULT_RATES: Dict[str, Tuple[float, float, float]] = {
+    provider: _PER_TOKEN_RATES[(provider, model)] for provider, model in DEFAULT_MODELS.items()
+}
+
+
+def _rates_for(provider: str, model: str) -> Optional[Tuple[float, float, float]]:
+    """Per-token (input, cached input, output) rates, falling back to the provider default; None if unpriced."""
+    return _PER_TOKEN_RATES.get((provider, model)) or _DEFAULT_RATES.get(provider)
+
+
+def _per_token_rates(provider: str, model: str) -> Optional[Tuple[float, float]]:
+    """Per-token (input, output) rates for a model; None if unpriced."""
+    rates = _rates_for(provider, model)
+    return (rates[0], rates[2]) if rates is not None else None
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class TokenCount:
     """Token usage for a single request."""
 
     input_tokens: int = 0
     output_tokens: int = 0
+    # Portion of input_tokens served from the provider's prompt cache
+    cached_input_tokens: int = 0
 
     @property
     def total(self) -> int:
         return self.input_tokens + self.output_tokens
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CostBreakdown:
     """Cost breakdown for a single request."""
 
@@ -55,7 +105,7 @@ class CostBreakdown:
         return self.input_cost_usd + self.output_cost_usd
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryCostAnalysis:
     """Complete cost analysis for a single query."""
 
@@ -66,6 +116,8 @@ class QueryCostAnalysis:
     model: str
     tokens: TokenCount = field(default_factory=TokenCount)
     cost: CostBreakdown = field(default_factory=CostBreakdown)
+    # Tracked analyses are write-once, so the rendered dict is built only once
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def cost_per_ticker(self) -> float:
@@ -82,15 +134,32 @@ class QueryCostAnalysis:
         return self.tokens.total // len(self.tickers)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+        """Convert to dictionary for JSON serialization.
+
+        The rendered values are memoized on first call; every call returns a
+        fresh copy, so callers may modify it without touching the stored record.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        rendered = self._cached_dict
+        # Leaves are scalars, so copying each container level is a full copy
+        return {
+            **rendered,
+            "tickers": list(rendered["tickers"]),
+            "tokens": dict(rendered["tokens"]),
+            "cost": dict(rendered["cost"]),
+        }
+
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "query": self.query,
-            "tickers": self.tickers,
+            "tickers": list(self.tickers),
             "period": self.period,
             "provider": self.provider,
             "model": self.model,
             "tokens": {
                 "input": self.tokens.input_tokens,
+                "cached_input": self.tokens.cached_input_tokens,
                 "output": self.tokens.output_tokens,
                 "total": self.tokens.total,
                 "per_ticker": self.tokens_per_ticker,
@@ -104,12 +173,56 @@ class QueryCostAnalysis:
         }
 
 
+def _build_cost_comparison() -> Dict[str, Any]:
+    """OpenAI vs Anthropic default-model cost for typical research queries."""
+    openai_in, openai_out = _per_token_rates("openai", DEFAULT_MODELS["openai"])
+    anthropic_in, anthropic_out = _per_token_rates("anthropic", DEFAULT_MODELS["anthropic"])
+
+    # Typical token usage (estimated from actual queries)
+    typical_queries = [
+        {"name": "single_ticker", "input": 800, "output": 250},
+        {"name": "two_tickers", "input": 1600, "output": 350},
+        {"name": "five_tickers", "input": 3500, "output": 400},
+    ]
+
+    comparison = {}
+    for q in typical_queries:
+        openai_cost = q["input"] * openai_in + q["output"] * openai_out
+        anthropic_cost = q["input"] * anthropic_in + q["output"] * anthropic_out
+        comparison[q["name"]] = {
+            "tokens": {"input": q["input"], "output": q["output"]},
+            "openai_cost_usd": round(openai_cost, 6),
+            "anthropic_cost_usd": round(anthropic_cost, 6),
+            "anthropic_more_expensive": anthropic_cost > openai_cost,
+            "cost_ratio": round(anthropic_cost / openai_cost, 2),
+        }
+    return comparison
+
+
+_COST_COMPARISON = _build_cost_comparison()
+
+
+def _new_provider_totals() -> Dict[str, Any]:
+    return {
+        "queries": 0,
+        "total_tokens": 0,
+        "total_cost_usd": 0.0,
+        "models": defaultdict(lambda: {"queries": 0, "cost_usd": 0.0}),
+    }
+
+
 class CostAnalyzer:
     """Analyze and track costs of research agent queries."""
 
     def __init__(self) -> None:
         """Initialize cost analyzer."""
         self.queries: List[QueryCostAnalysis] = []
+        # Running aggregates, updated in track_query so summaries never rescan queries
+        self._total_tokens = 0
+        self._total_cost_usd = 0.0
+        self._providers: DefaultDict[str, Dict[str, Any]] = defaultdict(_new_provider_totals)
+        # Agents may track queries from several threads (e.g. concurrent eval runs)
+        self._lock = threading.Lock()
 
     def calculate_cost(
         self,
@@ -117,21 +230,22 @@ class CostAnalyzer:
         model: str,
         input_tokens: int,
         output_tokens: int,
+        cached_input_tokens: int = 0,
     ) -> CostBreakdown:
-        """Calculate cost based on provider, model, and token counts."""
-        if provider == "openai":
-            pricing = OPENAI_PRICING.get(model, OPENAI_PRICING["gpt-4o-mini"])
-        elif provider == "anthropic":
-            pricing = ANTHROPIC_PRICING.get(
-                model, ANTHROPIC_PRICING["claude-3-5-sonnet-20241022"]
-            )
-        else:
-            return CostBreakdown()
-
-        input_cost = (input_tokens / 1_000_000) * pricing["input_per_1m"]
-        output_cost = (output_tokens / 1_000_000) * pricing["output_per_1m"]
+        """Calculate cost based on provider, model, and token counts.
 
-        return CostBreakdown(input_cost_usd=input_cost, output_cost_usd=output_cost)
+        ``cached_input_tokens`` is the part of ``input_tokens`` served from the
+        provider's prompt cache, billed at the discounted cached rate.
+        """
+        rates = _rates_for(provider, model)
+        if rates is None:
+            return CostBreakdown()
+        input_rate, cached_rate, output_rate = rates
+        cached = min(cached_input_tokens, input_tokens)
+        return CostBreakdown(
+            input_cost_usd=(input_tokens - cached) * input_rate + cached * cached_rate,
+            output_cost_usd=output_tokens * output_rate,
+        )
 
     def track_query(
         self,
@@ -142,13 +256,20 @@ class CostAnalyzer:
         model: str,
         input_tokens: int,
         output_tokens: int,
+        cached_input_tokens: int = 0,
     ) -> QueryCostAnalysis:
         """Track a single query's cost."""
+        # Low-cardinality labels are interned so long sessions share one copy
+        provider = sys.intern(provider)
+        model = sys.intern(model)
+        period = sys.intern(period)
+        tickers = [sys.intern(ticker) for ticker in tickers]
         tokens = TokenCount(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
+            cached_input_tokens=cached_input_tokens,
         )
-        cost = self.calculate_cost(provider, model, input_tokens, output_tokens)
+        cost = self.calculate_cost(provider, model, input_tokens, output_tokens, cached_input_tokens)
 
         analysis = QueryCostAnalysis(
             query=query,
@@ -159,110 +280,76 @@ class CostAnalyzer:
             tokens=tokens,
             cost=cost,
         )
-        self.queries.append(analysis)
+        with self._lock:
+            self.queries.append(analysis)
+            self._accumulate(analysis)
         return analysis
 
-    def get_session_summary(self) -> Dict[str, Any]:
-        """Get cost summary for current session."""
+    def _accumulate(self, analysis: QueryCostAnalysis) -> None:
+        """Fold one tracked query into the session and provider totals."""
+        total_tokens = analysis.tokens.total
+        total_usd = analysis.cost.total_usd
+        self._total_tokens += total_tokens
+        self._total_cost_usd += total_usd
+
+        provider = self._providers[analysis.provider]
+        provider["queries"] += 1
+        provider["total_tokens"] += total_tokens
+        provider["total_cost_usd"] += total_usd
+
+        model = provider["models"][analysis.model]
+        model["queries"] += 1
+        model["cost_usd"] += total_usd
+
+    def get_session_summary(self, include_queries: bool = False) -> Dict[str, Any]:
+        """Get cost summary for current session.
+
+        Totals come from running aggregates, so the default call is O(1);
+        pass ``include_queries=True`` to also get every tracked query's dict.
+        """
         if not self.queries:
-            return {
+            summary: Dict[str, Any] = {
                 "total_queries": 0,
                 "total_tokens": 0,
                 "total_cost_usd": 0.0,
-                "queries": [],
             }
-
-        total_tokens = sum(q.tokens.total for q in self.queries)
-        total_cost_usd = sum(q.cost.total_usd for q in self.queries)
-        avg_cost_per_query = (
-            total_cost_usd / len(self.queries) if self.queries else 0.0
-        )
-        avg_tokens_per_query = (
-            total_tokens / len(self.queries) if self.queries else 0
-        )
-
-        return {
-            "total_queries": len(self.queries),
-            "total_tokens": total_tokens,
-            "total_cost_usd": round(total_cost_usd, 6),
-            "avg_cost_per_query": round(avg_cost_per_query, 6),
-            "avg_tokens_per_query": avg_tokens_per_query,
-            "queries": [q.to_dict() for q in self.queries],
-        }
+        else:
+            total_tokens = self._total_tokens
+            total_cost_usd = self._total_cost_usd
+            summary = {
+                "total_queries": len(self.queries),
+                "total_tokens": total_tokens,
+                "total_cost_usd": round(total_cost_usd, 6),
+                "avg_cost_per_query": round(total_cost_usd / len(self.queries), 6),
+                "avg_tokens_per_query": total_tokens / len(self.queries),
+            }
+        if include_queries:
+            summary["queries"] = [q.to_dict() for q in self.queries]
+        return summary
 
     def get_provider_breakdown(self) -> Dict[str, Dict[str, Any]]:
         """Get cost and token breakdown by provider."""
-        providers: Dict[str, Dict[str, Any]] = {}
-
-        for query in self.queries:
-            provider = query.provider
-            if provider not in providers:
-                providers[provider] = {
-                    "queries": 0,
-                    "total_tokens": 0,
-                    "total_cost_usd": 0.0,
-                    "models": {},
-                }
-
-            providers[provider]["queries"] += 1
-            providers[provider]["total_tokens"] += query.tokens.total
-            providers[provider]["total_cost_usd"] += query.cost.total_usd
-
-            model = query.model
-            if model not in providers[provider]["models"]:
-                providers[provider]["models"][model] = {
-                    "queries": 0,
-                    "cost_usd": 0.0,
-                }
-
-            providers[provider]["models"][model]["queries"] += 1
-            providers[provider]["models"][model]["cost_usd"] += query.cost.total_usd
-
-        # Round costs
-        for provider in providers:
-            providers[provider]["total_cost_usd"] = round(
-                providers[provider]["total_cost_usd"], 6
-            )
-            for model in providers[provider]["models"]:
-                providers[provider]["models"][model]["cost_usd"] = round(
-                    providers[provider]["models"][model]["cost_usd"], 6
-                )
-
-        return providers
+        # Rounded copies, so the running totals keep full precision
+        return {
+            name: {
+                "queries": totals["queries"],
+                "total_tokens": totals["total_tokens"],
+                "total_cost_usd": round(totals["total_cost_usd"], 6),
+                "models": {
+                    model: {"queries": stats["queries"], "cost_usd": round(stats["cost_usd"], 6)}
+                    for model, stats in totals["models"].items()
+                },
+            }
+            for name, totals in self._providers.items()
+        }
 
     def get_cost_comparison(self) -> Dict[str, Any]:
-        """Compare cost between OpenAI and Anthropic for same queries."""
-        openai_pricing = OPENAI_PRICING["gpt-4o-mini"]
-        anthropic_pricing = ANTHROPIC_PRICING["claude-3-5-sonnet-20241022"]
-
-        # Typical token usage (estimated from actual queries)
-        typical_queries = [
-            {"name": "single_ticker", "input": 800, "output": 250},
-            {"name": "two_tickers", "input": 1600, "output": 350},
-            {"name": "five_tickers", "input": 3500, "output": 400},
-        ]
-
-        comparison = {}
-        for q in typical_queries:
-            openai_cost = (q["input"] / 1_000_000) * openai_pricing[
-                "input_per_1m"
-            ] + (q["output"] / 1_000_000) * openai_pricing["output_per_1m"]
-
-            anthropic_cost = (q["input"] / 1_000_000) * anthropic_pricing[
-                "input_per_1m"
-            ] + (q["output"] / 1_000_000) * anthropic_pricing["output_per_1m"]
-
-            savings_pct = ((anthropic_cost - openai_cost) / anthropic_cost) * 100
-
-            comparison[q["name"]] = {
-                "tokens": {"input": q["input"], "output": q["output"]},
-                "openai_cost_usd": round(openai_cost, 6),
-                "anthropic_cost_usd": round(anthropic_cost, 6),
-                "anthropic_more_expensive": anthropic_cost > openai_cost,
-                "cost_ratio": round(anthropic_cost / openai_cost, 2),
-            }
+        """Compare cost between OpenAI and Anthropic for same queries.
 
-        return comparison
+        The comparison depends only on the static pricing tables, so it is
+        computed once at import; treat the returned dict as read-only.
+        """
+        return _COST_COMPARISON
 
 
 # Global analyzer instance
@@ -296,34 +383,22 @@ def batch_analyze(
         Dict with total cost, tokens, and breakdown
     """
     if model is None:
-        model = (
-            "gpt-4o-mini" if provider == "openai" else "claude-3-5-sonnet-20241022"
-        )
-
-    analyzer = CostAnalyzer()
-    total_cost = 0.0
-    total_tokens = 0
-
-    for query_text, tickers, period in queries:
-        # Estimate tokens (rough heuristic)
-        num_tickers = len(tickers) if tickers else 1
-        estimated_input = 800 + (num_tickers - 1) * 400
-        estimated_output = 250 + (num_tickers - 1) * 50
-
-        analysis = analyzer.track_query(
-            query=query_text,
-            tickers=tickers or [],
-            period=period or "3mo",
-            provider=provider,
-            model=model,
-            input_tokens=estimated_input,
-            output_tokens=estimated_output,
-        )
-
-        total_cost += analysis.cost.total_usd
-        total_tokens += analysis.tokens.total
+        model = DEFAULT_MODELS.get(provider, DEFAULT_MODELS["anthropic"])
+
+    # Estimate tokens for the whole batch at once (rough heuristic per query)
+    num_tickers = np.fromiter(
+        (len(tickers) if tickers else 1 for _, tickers, _ in queries),
+        dtype=np.int64,
+        count=len(queries),
+    )
+    estimated_input = 800 + (num_tickers - 1) * 400
+    estimated_output = 250 + (num_tickers - 1) * 50
+
+    rates = _per_token_rates(provider, model)
+    input_rate, output_rate = rates if rates is not None else (0.0, 0.0)
+    total_cost = float(estimated_input.sum() * input_rate + estimated_output.sum() * output_rate)
+    total_tokens = int(estimated_input.sum() + estimated_output.sum())
 
-    summary = analyzer.get_session_summary()
     return {
         "total_queries": len(queries),
         "total_cost_usd": round(total_cost, 6),
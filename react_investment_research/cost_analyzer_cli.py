@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+from functools import lru_cache
 from typing import Any, Dict
 
 from .cost_analyzer import batch_analyze, get_global_analyzer
@@ -18,45 +20,52 @@ def analyze_session() -> None:
         print("No queries tracked in session.")
         return
     
-    print(f"Session Summary")
-    print(f"  Total queries: {summary['total_queries']}")
-    print(f"  Total tokens: {summary['total_tokens']}")
-    print(f"  Total cost: ${summary['total_cost_usd']:.6f}")
-    print(f"  Avg cost/query: ${summary['avg_cost_per_query']:.6f}")
-    print(f"  Avg tokens/query: {summary['avg_tokens_per_query']}")
-    
-    print("\nProvider Breakdown")
-    providers = analyzer.get_provider_breakdown()
-    for provider, data in providers.items():
-        print(f"  {provider}:")
-        print(f"    Queries: {data['queries']}")
-        print(f"    Total tokens: {data['total_tokens']}")
-        print(f"    Total cost: ${data['total_cost_usd']:.6f}")
+    # Render the whole report, then write it in one call
+    lines = [
+        "Session Summary",
+        f"  Total queries: {summary['total_queries']}",
+        f"  Total tokens: {summary['total_tokens']}",
+        f"  Total cost: ${summary['total_cost_usd']:.6f}",
+        f"  Avg cost/query: ${summary['avg_cost_per_query']:.6f}",
+        f"  Avg tokens/query: {summary['avg_tokens_per_query']}",
+        "",
+        "Provider Breakdown",
+    ]
+    for provider, data in analyzer.get_provider_breakdown().items():
+        lines.append(f"  {provider}:")
+        lines.append(f"    Queries: {data['queries']}")
+        lines.append(f"    Total tokens: {data['total_tokens']}")
+        lines.append(f"    Total cost: ${data['total_cost_usd']:.6f}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def compare_providers() -> None:
-    """Compare costs between OpenAI and Anthropic."""
-    analyzer = get_global_analyzer()
-    comparison = analyzer.get_cost_comparison()
-    
-    print("Cost Comparison: OpenAI vs Anthropic")
-    print("(for typical investment research queries)\n")
-    
+@lru_cache(maxsize=None)
+def _render_comparison() -> str:
+    """Comparison report text; the comparison is static, so it is rendered once."""
+    comparison = get_global_analyzer().get_cost_comparison()
+    lines = [
+        "Cost Comparison: OpenAI vs Anthropic",
+        "(for typical investment research queries)",
+        "",
+    ]
     for query_type, data in comparison.items():
         tokens = data['tokens']
-        openai_cost = data['openai_cost_usd']
-        anthropic_cost = data['anthropic_cost_usd']
         ratio = data['cost_ratio']
-        
-        print(f"{query_type}:")
-        print(f"  Tokens: {tokens['input']} input + {tokens['output']} output")
-        print(f"  OpenAI:    ${openai_cost:.6f}")
-        print(f"  Anthropic: ${anthropic_cost:.6f}")
+        lines.append(f"{query_type}:")
+        lines.append(f"  Tokens: {tokens['input']} input + {tokens['output']} output")
+        lines.append(f"  OpenAI:    ${data['openai_cost_usd']:.6f}")
+        lines.append(f"  Anthropic: ${data['anthropic_cost_usd']:.6f}")
         if data['anthropic_more_expensive']:
-            print(f"  ⚠️  Anthropic is {(ratio-1)*100:.1f}% MORE expensive")
+            lines.append(f"  ⚠️  Anthropic is {(ratio-1)*100:.1f}% MORE expensive")
         else:
-            print(f"  ✓ Anthropic is {(1-ratio)*100:.1f}% CHEAPER")
-        print()
+            lines.append(f"  ✓ Anthropic is {(1-ratio)*100:.1f}% CHEAPER")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def compare_providers() -> None:
+    """Compare costs between OpenAI and Anthropic."""
+    sys.stdout.write(_render_comparison())
 
 
 def batch_cost_estimation(num_queries: int, provider: str, num_tickers: int) -> None:
@@ -67,11 +76,9 @@ def batch_cost_estimation(num_queries: int, provider: str, num_tickers: int) ->
     print(f"  Tickers per query: {num_tickers}")
     print()
     
-    # Generate sample queries
-    queries = []
-    for i in range(num_queries):
-        tickers = [f"TICK{j}" for j in range(num_tickers)]
-        queries.append((f"Query {i+1}", tickers, "3mo"))
+    # Generate sample queries; every query shares one read-only ticker list
+    tickers = [f"TICK{j}" for j in range(num_tickers)]
+    queries = [(f"Query {i+1}", tickers, "3mo") for i in range(num_queries)]
     
     result = batch_analyze(queries, provider=provider)
     
@@ -91,7 +98,8 @@ def estimate_monthly_cost(queries_per_day: int, provider: str) -> None:
     print()
     
     # Typical single-ticker query
-    queries = [(f"Daily query {i}", ["STOCK"], "3mo") for i in range(queries_per_day)]
+    tickers = ["STOCK"]
+    queries = [(f"Daily query {i}", tickers, "3mo") for i in range(queries_per_day)]
     result = batch_analyze(queries, provider=provider)
     
     daily_cost = result['total_cost_usd']
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
 from .agent import ResearchAgent
 from .schemas import validate_schema
+from .tools.providers import clear_provider_cache
 
 
-def run_eval() -> Dict[str, Any]:
-    agent = ResearchAgent(offline=True)
+def _run_case(agent: ResearchAgent, case: Dict[str, Any]) -> Dict[str, Any]:
+    # Each case fetches its own data rather than scoring on what another case cached
+    clear_provider_cache()
+    return agent.run(**case)
+
+
+def run_eval(offline: bool = True) -> Dict[str, Any]:
+    agent = ResearchAgent(offline=offline)
     cases = [
         {"query": "trend summary for AAPL", "tickers": ["AAPL"], "period": "3mo"},
         {"query": "compare AAPL vs MSFT", "tickers": ["AAPL", "MSFT"], "period": "6mo"},
@@ -18,8 +26,12 @@ def run_eval() -> Dict[str, Any]:
     results: List[Dict[str, Any]] = []
     score = 0
 
-    for case in cases:
-        output = agent.run(**case)
+    # Cases are independent; live runs (offline=False) wait on LLM and network
+    # calls, so the cases overlap on a thread pool. map() keeps case order.
+    with ThreadPoolExecutor(max_workers=len(cases)) as executor:
+        outputs = list(executor.map(lambda case: _run_case(agent, case), cases))
+
+    for output in outputs:
         ok, _ = validate_schema("final_output", output)
         if ok:
             score += 2
@@ -1,18 +1,437 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from typing import Any, Dict
+import re
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from importlib.util import find_spec
+from types import SimpleNamespace
+from typing import Any, Callable, Dict
 
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None
+from .cache import MemoryCache, SemanticCache
 
-try:
-    import anthropic
-except ImportError:
-    anthropic = None
+# Provider SDKs are heavy (HTTP/TLS stacks), so they are imported on first use;
+# only their availability is checked up front
+OpenAI: Any = None
+anthropic: Any = None
+
+
+def _sdk_available(module_name: str) -> bool:
+    return find_spec(module_name) is not None
+
+
+def _openai_class() -> Any:
+    global OpenAI
+    if OpenAI is None:
+        from openai import OpenAI as openai_class
+
+        OpenAI = openai_class
+    return OpenAI
+
+
+def _anthropic_module() -> Any:
+    global anthropic
+    if anthropic is None:
+        import anthropic as anthropic_module
+
+        anthropic = anthropic_module
+    return anthropic
+
+# Prompts are split into a stable prefix (instructions, tool descriptions) sent
+# as the system prompt and a volatile suffix (query, tickers, data) sent as the
+# user message, so providers can serve the repeated prefix from prompt cache.
+SUMMARY_INSTRUCTIONS = """You are an investment research analyst. Analyze the market data in the user message and generate a research summary.
+
+Generate a JSON response with:
+- thesis_bullets: list of 1-3 key insights about the tickers (string format)
+- risks: list of 0-2 key risks or concerns (string format)
+
+Respond with ONLY valid JSON, no markdown or extra text."""
+
+INFER_TICKERS_INSTRUCTIONS = """Extract up to 5 likely stock or ETF tickers from the user query.
+
+Rules:
+- Return ONLY a JSON object with a key "tickers".
+- Use uppercase ticker symbols only.
+- If no tickers are implied, return an empty list.
+
+Example:
+{"tickers": ["NVDA", "AMD"]}"""
+
+DECIDE_TOOLS_TEMPLATE = """You are an investment research agent. Given a user query and available tools, decide which tools to invoke.
+
+Available Tools:
+{tools_description}
+
+For each relevant tool, specify which tickers it should be called for.
+
+Rules:
+- Include only relevant tools for the query
+- You can call same tool for different ticker subsets if needed
+- Return empty list if no tools are relevant
+- Use ticker symbols from the provided list only"""
+
+PLAN_RESEARCH_TEMPLATE = """You are an investment research agent. Complete both tasks below for the user query and answer with a single JSON object.
+
+### TASK 1 ###
+Extract up to 5 likely stock or ETF tickers implied by the query.
+- Use uppercase ticker symbols only.
+- If no tickers are implied, return an empty list.
+
+### TASK 2 ###
+Decide which of the available tools to invoke for the tickers from TASK 1.
+
+Available Tools:
+{tools_description}
+
+- Include only relevant tools for the query
+- Use ticker symbols from TASK 1 only
+
+Return ONLY a JSON object with keys "tickers" (TASK 1) and "tools" (TASK 2). The "tools" key follows this format:
+{example_json}"""
+
+
+# Volatile per-request suffixes (user messages)
+QUERY_TEMPLATE = "User Query: {query}"
+
+SUMMARY_REQUEST_TEMPLATE = """User Query: {query}
+Tickers: {tickers}
+
+Market Data:
+{data}"""
+
+DECIDE_TOOLS_REQUEST_TEMPLATE = """User Query: {query}
+Tickers to Analyze: {tickers}
+
+Return ONLY a JSON object:
+{example_json}"""
+
+# Exact-repeat prompts are answered from memory for this long
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL_SECONDS = 1800
+
+# Paraphrased summary queries over the same tickers and data can be answered
+# from an in-memory semantic cache (OpenAI embeddings only); opt in with
+# RESEARCH_SEMANTIC_CACHE=1. Ticker inference and planning are never served
+# from it: queries naming different companies embed too close together.
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_ENV = "RESEARCH_SEMANTIC_CACHE"
+
+_ZERO_USAGE = {"input": 0, "cached_input": 0, "output": 0, "total": 0}
+
+SUMMARY_MAX_TOKENS = 500
+
+# Batch jobs are billed at half price but may take up to 24h to complete
+BATCH_POLL_SECONDS = 30.0
+_OPENAI_BATCH_DONE = frozenset({"completed", "failed", "expired", "cancelled"})
+
+OPENAI_MODEL = "gpt-4o-mini"
+ANTHROPIC_MODEL = "claude-3-5-sonnet-20241022"
+
+# Model per task: "extract" covers the short structured calls (ticker
+# inference, research planning, tool routing) and "reason" writes summaries.
+# LLMClient.models holds a per-instance copy.
+TASK_MODELS: Dict[str, Dict[str, str]] = {
+    "openai": {"extract": OPENAI_MODEL, "reason": OPENAI_MODEL},
+    "anthropic": {"extract": "claude-3-5-haiku-20241022", "reason": ANTHROPIC_MODEL},
+}
+
+# Routes requests sharing our stable prefixes to the same OpenAI prompt cache
+OPENAI_PROMPT_CACHE_BODY = {"prompt_cache_key": "react_investment_research_v1"}
+
+
+# Every prompt asks for a bare JSON object; JSON mode guarantees one (no fences)
+OPENAI_JSON_RESPONSE = {"type": "json_object"}
+# Anthropic has no JSON mode; prefilling the reply with "{" makes the model
+# continue a JSON object instead of opening with prose or a code fence
+ANTHROPIC_JSON_PREFILL = "{"
+
+
+def _openai_messages(prefix: str, suffix: str) -> list[Dict[str, str]]:
+    """Chat messages with the stable prefix first so OpenAI can cache it."""
+    return [
+        {"role": "system", "content": prefix},
+        {"role": "user", "content": suffix},
+    ]
+
+
+def _usage_count(usage: Any, name: str) -> int:
+    """Integer usage field, or 0 when the SDK/model does not report it."""
+    value = getattr(usage, name, 0)
+    return value if isinstance(value, int) else 0
+
+
+def _openai_usage(message: Any) -> Dict[str, int]:
+    """Token usage; OpenAI's prompt_tokens already include cache hits."""
+    usage = message.usage
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input": usage.prompt_tokens,
+        "cached_input": _usage_count(details, "cached_tokens"),
+        "output": usage.completion_tokens,
+        "total": usage.total_tokens,
+    }
+
+
+def _anthropic_usage(message: Any) -> Dict[str, int]:
+    """Token usage with Anthropic's separately reported cache reads/writes folded into input."""
+    usage = message.usage
+    cached = _usage_count(usage, "cache_read_input_tokens")
+    input_tokens = usage.input_tokens + cached + _usage_count(usage, "cache_creation_input_tokens")
+    return {
+        "input": input_tokens,
+        "cached_input": cached,
+        "output": usage.output_tokens,
+        "total": input_tokens + usage.output_tokens,
+    }
+
+
+# Well-known symbols that are safe to take literally from a query. Symbols
+# that are also common words or abbreviations (IT, ON, ALL, AI, MA, LOW,
+# COST, CAT, ...) are deliberately left out so those queries still go to the
+# model.
+_KNOWN_TICKERS = frozenset({
+    "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "GOOG", "META", "TSLA", "AMD", "INTC",
+    "AVGO", "ORCL", "CRM", "ADBE", "NFLX", "QCOM", "TXN", "MU", "IBM", "CSCO",
+    "TSM", "ASML", "SMCI", "PLTR", "UBER", "ABNB",
+    "PYPL", "BABA", "JPM", "BAC", "WFC", "GS", "BRK", "JNJ", "PFE", "MRK",
+    "ABBV", "LLY", "UNH", "XOM", "CVX", "COP", "PEP", "WMT",
+    "MCD", "NKE", "SBUX", "HON", "LMT", "RTX",
+    "SPY", "QQQ", "IWM", "DIA", "VTI", "VOO", "TLT", "IEF", "GLD",
+    "SLV", "USO", "XLE", "XLF", "XLK", "XLV", "XLY", "XLP", "XLI", "XLU",
+    "HYG", "LQD", "EEM", "EFA", "VNQ", "ARKK", "SMH", "SOXX",
+})
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+\s*")
+_WORD_RE = re.compile(r"[A-Za-z][\w'&-]*")
+_MAX_INFERRED_TICKERS = 5
+
+
+def _explicit_tickers(query: str) -> list[str]:
+    """Known tickers written out in the query, in order of first mention.
+
+    Returns [] unless every symbol- or name-like word resolves to a known
+    ticker: an unknown symbol (MS) or a company name (Broadcom) means the
+    model could find tickers this shortcut would drop.
+    """
+    found: Dict[str, None] = {}
+    for sentence in _SENTENCE_SPLIT_RE.split(query):
+        for index, word in enumerate(_WORD_RE.findall(sentence)):
+            if word == "I" or not word[0].isupper():
+                continue
+            if index == 0 and not word.isupper():
+                # Capitalised only because it starts the sentence
+                continue
+            if word not in _KNOWN_TICKERS:
+                return []
+            found[word] = None
+    return list(found)[:_MAX_INFERRED_TICKERS]
+
+
+# Payload fields the summary prompt never needs: the ticker is already the
+# dict key, and dates/intervals are request metadata rather than evidence
+_SUMMARY_DROP_FIELDS = frozenset({"ticker", "asof", "interval"})
+# Longest list (notes, flags, relative rows) passed to the summary prompt
+_SUMMARY_LIST_LIMIT = 5
+# Longest string value (notes, headlines, error reasons) passed to the summary prompt
+_SUMMARY_STRING_LIMIT = 200
+_TRUNCATED_MARKER = "...(truncated)"
+
+
+def _prune_for_prompt(value: Any) -> Any:
+    """Drop None/empty values, keep only the last few list entries and cap long strings."""
+    if isinstance(value, dict):
+        pruned = {key: _prune_for_prompt(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, {}, [], "")}
+    if isinstance(value, list):
+        return [_prune_for_prompt(item) for item in value[-_SUMMARY_LIST_LIMIT:]]
+    if isinstance(value, str) and len(value) > _SUMMARY_STRING_LIMIT:
+        return value[:_SUMMARY_STRING_LIMIT] + _TRUNCATED_MARKER
+    return value
+
+
+def _summary_tool_outputs(tool_outputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Shrink {section: {ticker: payload}} to the fields the analyst prompt uses."""
+    compact: Dict[str, Any] = {}
+    for section, payloads in tool_outputs.items():
+        if not isinstance(payloads, dict):
+            compact[section] = _prune_for_prompt(payloads)
+            continue
+        compact[section] = {
+            ticker: _prune_for_prompt(
+                {key: item for key, item in payload.items() if key not in _SUMMARY_DROP_FIELDS}
+                if isinstance(payload, dict) and "error" not in payload
+                else payload
+            )
+            for ticker, payload in payloads.items()
+        }
+    return compact
+
+
+# One tool per "- tool_name [PAID/FREE] $0.05/call: description" line
+_TOOL_LINE_RE = re.compile(r"^\s*-\s*([^:\n]*?)\s*(?:\[(?:PAID|FREE)\]\s*)?(?:\$[^:\n]*?/call\s*)?:", re.M)
+
+
+@lru_cache(maxsize=8)
+def _tool_names_from_description(tools_description: str) -> tuple[str, ...]:
+    """Tool names listed in a registry prompt description (same string every request)."""
+    return tuple(name for name in _TOOL_LINE_RE.findall(tools_description) if name)
+
+
+# [PAID]/[FREE] tags and trailing price info like "$0.05/call"
+_TOOL_CLEAN_RE = re.compile(r"\[(?:PAID|FREE)\]|\$.*", re.S)
+
+
+@lru_cache(maxsize=32)
+def _tool_decision_example_json(tools_description: str, example_tickers: tuple[str, ...]) -> str:
+    """Example routing JSON for the first one or two registry tools (none if the
+    description lists no tools), memoized per description and example tickers."""
+    tickers = list(example_tickers)
+    example_tools = [
+        {"tool": tool_name, "tickers": tickers}
+        for tool_name in _tool_names_from_description(tools_description)[:2]
+    ]
+    return json.dumps({"tools": example_tools})
+
+
+def _clean_tool_name(name: str) -> str:
+    return _TOOL_CLEAN_RE.sub("", name).strip()
+
+
+def _clean_tool_decisions(tools: Any) -> list[Any]:
+    """Strip [PAID]/[FREE] tags and price labels the model may copy into tool names."""
+    if not isinstance(tools, list):
+        return []
+    return [
+        {**tool, "tool": _clean_tool_name(tool["tool"])}
+        if isinstance(tool, dict) and isinstance(tool.get("tool"), str)
+        else tool
+        for tool in tools
+    ]
+
+
+def _anthropic_system(prefix: str) -> list[Dict[str, Any]]:
+    """System block with the stable prefix marked for Anthropic prompt caching."""
+    return [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+
+
+def _openai_request(prefix: str, suffix: str, max_tokens: int, model: str = OPENAI_MODEL) -> Dict[str, Any]:
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "messages": _openai_messages(prefix, suffix),
+        "response_format": OPENAI_JSON_RESPONSE,
+    }
+
+
+def _anthropic_request(prefix: str, suffix: str, max_tokens: int, model: str = ANTHROPIC_MODEL) -> Dict[str, Any]:
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "system": _anthropic_system(prefix),
+        "messages": [
+            {"role": "user", "content": suffix},
+            {"role": "assistant", "content": ANTHROPIC_JSON_PREFILL},
+        ],
+    }
+
+
+def _openai_result(message: Any, model: str = OPENAI_MODEL) -> tuple[str, Dict[str, Any]]:
+    meta = {"llm_tokens": _openai_usage(message), "llm_provider": "openai", "llm_model": model}
+    return message.choices[0].message.content.strip(), meta
+
+
+def _anthropic_result(message: Any, model: str = ANTHROPIC_MODEL) -> tuple[str, Dict[str, Any]]:
+    meta = {"llm_tokens": _anthropic_usage(message), "llm_provider": "anthropic", "llm_model": model}
+    return _with_json_prefill(message.content[0].text.strip()), meta
+
+
+def _with_json_prefill(text: str) -> str:
+    """Re-attach the prefilled opening brace the model continued from."""
+    return text if text.startswith(ANTHROPIC_JSON_PREFILL) else ANTHROPIC_JSON_PREFILL + text
+
+
+def _summary_from_text(response_text: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    result = json.loads(response_text)
+    return {
+        "thesis_bullets": result.get("thesis_bullets", []),
+        "risks": result.get("risks", []),
+        **meta,
+    }
+
+
+def _batch_timed_out(deadline: float | None, poll_interval: float) -> bool:
+    """Sleep until the next batch poll; True once ``deadline`` (monotonic) has passed."""
+    if deadline is None:
+        time.sleep(poll_interval)
+        return False
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return True
+    time.sleep(min(poll_interval, remaining))
+    return False
+
+
+class _SummaryItemParser:
+    """Pick finished thesis_bullets/risks strings out of a partially streamed JSON object.
+
+    Fragments are appended to a buffer that is scanned once, left to right;
+    scanner state (string/escape flags, container stack, current top-level
+    key) carries over between feeds. Each array string is reported once its
+    closing quote arrives.
+    """
+
+    FIELDS = ("thesis_bullets", "risks")
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: str | None = None
+
+    def feed(self, fragment: str) -> list[tuple[str, str]]:
+        """Consume a text fragment; returns newly completed (field, text) items."""
+        self._buffer += fragment
+        items: list[tuple[str, str]] = []
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._on_string(json.loads(buffer[self._string_start:pos + 1]), items)
+            elif char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                self._stack.append(char)
+                self._expect_key = char == "{"
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+            elif char == ":":
+                self._expect_key = False
+            elif char == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1] == "{"
+        self._pos = len(buffer)
+        return items
+
+    def _on_string(self, value: str, items: list[tuple[str, str]]) -> None:
+        if len(self._stack) == 1 and self._expect_key:
+            self._key = value
+        elif self._stack == ["{", "["] and self._key in self.FIELDS:
+            items.append((self._key, value))
 
 
 class LLMClient:
@@ -20,40 +439,147 @@ class LLMClient:
 
     def __init__(self) -> None:
         self.provider = None
-        if os.environ.get("OPENAI_API_KEY") and OpenAI:
+        # Keys are read once; later SDK client creation reuses them
+        self._api_keys = {
+            "openai": os.environ.get("OPENAI_API_KEY"),
+            "anthropic": os.environ.get("ANTHROPIC_API_KEY"),
+        }
+        if self._api_keys["openai"] and _sdk_available("openai"):
             self.provider = "openai"
             self.enabled = True
-        elif os.environ.get("ANTHROPIC_API_KEY") and anthropic:
+        elif self._api_keys["anthropic"] and _sdk_available("anthropic"):
             self.provider = "anthropic"
             self.enabled = True
         else:
             self.enabled = False
+        # SDK clients (and their HTTP connection pools) are created once on
+        # first use and shared by every later request, including concurrent ones
+        self._clients: Dict[str, Any] = {}
+        self._clients_lock = threading.Lock()
+        # Per-instance copy so callers can swap in e.g. a cheaper "extract" model
+        self.models = {provider: dict(models) for provider, models in TASK_MODELS.items()}
+        self._response_cache = MemoryCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._semantic_cache = None
+        if self.provider == "openai" and os.environ.get(SEMANTIC_CACHE_ENV, "").lower() in ("1", "true", "yes"):
+            self._semantic_cache = SemanticCache(self._openai_embed)
+
+    def _shared_client(self, provider: str, factory: Callable[[], Any]) -> Any:
+        client = self._clients.get(provider)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(provider)
+                if client is None:
+                    client = self._clients[provider] = factory()
+        return client
+
+    def _openai_client(self) -> Any:
+        return self._shared_client(
+            "openai", lambda: _openai_class()(api_key=self._api_keys["openai"])
+        )
+
+    def _anthropic_client(self) -> Any:
+        return self._shared_client(
+            "anthropic", lambda: _anthropic_module().Anthropic(api_key=self._api_keys["anthropic"])
+        )
+
+    def _openai_embed(self, text: str) -> list[float]:
+        response = self._openai_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+        return response.data[0].embedding
+
+    def _semantic_lookup(self, namespace: tuple[Any, ...], text: str) -> tuple[Any, Dict[str, Any] | None]:
+        """Embed ``text`` and return (vector, cached result marked as a free hit)."""
+        if self._semantic_cache is None:
+            return None, None
+        vector = self._semantic_cache.embed(text)
+        cached = self._semantic_cache.lookup(namespace, vector)
+        if cached is None:
+            return vector, None
+        return vector, {**cached, "llm_tokens": dict(_ZERO_USAGE), "llm_cached": True}
+
+    def _semantic_store(self, namespace: tuple[Any, ...], vector: Any, result: Dict[str, Any]) -> None:
+        if self._semantic_cache is not None and "llm_error" not in result:
+            self._semantic_cache.store(namespace, vector, result)
 
     def generate_summary(
         self,
         query: str,
         tickers: list[str],
         tool_outputs: Dict[str, Any],
+        on_item: Callable[[str, str], None] | None = None,
     ) -> Dict[str, Any]:
         """Use LLM to generate thesis bullets and risks from tool outputs.
         
-        Returns dict with optional llm_tokens and llm_cost_usd fields.
+        Returns dict with optional llm_tokens and llm_cost_usd fields. With
+        ``on_item``, the response is streamed and ``on_item(field, text)`` is
+        called for each thesis bullet or risk as soon as it is complete.
+        Cached answers are returned without calling ``on_item``.
         """
         if not self.enabled:
             return {"thesis_bullets": [], "risks": []}
 
         if self.provider == "openai":
-            return self._openai_summary(query, tickers, tool_outputs)
+            return self._openai_summary(query, tickers, tool_outputs, on_item)
         elif self.provider == "anthropic":
-            return self._anthropic_summary(query, tickers, tool_outputs)
+            return self._anthropic_summary(query, tickers, tool_outputs, on_item)
 
         return {"thesis_bullets": [], "risks": []}
 
+    def generate_summary_batch(
+        self,
+        jobs: list[tuple[str, list[str], Dict[str, Any]]],
+        poll_interval: float | None = None,
+        timeout: float | None = None,
+    ) -> list[Dict[str, Any]]:
+        """Summarize many (query, tickers, tool_outputs) jobs through the provider's Batch API.
+
+        For non-interactive workloads (nightly runs, backfills): tokens cost half
+        as much, but this blocks, polling every ``poll_interval`` seconds
+        (default BATCH_POLL_SECONDS), until the provider finishes the batch. A
+        batch still running after ``timeout`` seconds is cancelled. Results
+        are returned in job order with the same shape as generate_summary plus
+        ``llm_batch``; a job that failed carries ``llm_error``.
+        """
+        if not jobs:
+            return []
+        if not self.enabled:
+            return [{"thesis_bullets": [], "risks": []} for _ in jobs]
+
+        prompts = {f"sum-{i}": self._summary_prompt(*job) for i, job in enumerate(jobs)}
+        poll_interval = BATCH_POLL_SECONDS if poll_interval is None else poll_interval
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            if self.provider == "openai":
+                outcomes = self._openai_batch(prompts, SUMMARY_MAX_TOKENS, poll_interval, deadline)
+            else:
+                outcomes = self._anthropic_batch(prompts, SUMMARY_MAX_TOKENS, poll_interval, deadline)
+        except Exception as e:
+            return [{"thesis_bullets": [], "risks": [], "llm_error": str(e)} for _ in jobs]
+
+        results = []
+        for custom_id in prompts:
+            outcome = outcomes.get(custom_id, RuntimeError("missing from batch results"))
+            if isinstance(outcome, Exception):
+                results.append({"thesis_bullets": [], "risks": [], "llm_error": str(outcome)})
+                continue
+            response_text, meta = outcome
+            try:
+                results.append({**_summary_from_text(response_text, meta), "llm_batch": True})
+            except Exception as e:
+                results.append({"thesis_bullets": [], "risks": [], "llm_error": str(e)})
+        return results
+
     def infer_tickers(self, query: str) -> Dict[str, Any]:
         """Infer likely tickers from a user query."""
         if not self.enabled:
             return {"tickers": [], "llm_error": "LLM disabled"}
 
+        # Queries that spell out known symbols need no model call
+        explicit = _explicit_tickers(query)
+        if explicit:
+            return {"tickers": explicit}
+
         if self.provider == "openai":
             return self._openai_infer_tickers(query)
         if self.provider == "anthropic":
@@ -88,6 +614,42 @@ class LLMClient:
 
         return {"tools": [], "llm_error": "Unknown LLM provider"}
 
+    def plan_research(
+        self,
+        query: str,
+        tools_description: str,
+    ) -> Dict[str, Any]:
+        """Infer tickers and decide tool routing in a single batched LLM call.
+        
+        Used when no explicit tickers are given, replacing separate
+        ``infer_tickers`` and ``decide_tools`` round-trips. The summary still
+        needs tool outputs, so ``generate_summary`` remains a separate call.
+        
+        Args:
+            query: User query to analyze
+            tools_description: Formatted description of available tools
+            
+        When the query already names known tickers, they are returned without
+        a model call and ``tools`` is left empty for the caller to route.
+
+        Returns:
+            Dict with 'tickers' and 'tools' keys:
+            {"tickers": ["NVDA"], "tools": [{"tool": "market_snapshot", "tickers": ["NVDA"]}]}
+        """
+        if not self.enabled:
+            return {"tickers": [], "tools": [], "llm_error": "LLM disabled"}
+
+        explicit = _explicit_tickers(query)
+        if explicit:
+            return {"tickers": explicit, "tools": []}
+
+        if self.provider == "openai":
+            return self._openai_plan_research(query, tools_description)
+        if self.provider == "anthropic":
+            return self._anthropic_plan_research(query, tools_description)
+
+        return {"tickers": [], "tools": [], "llm_error": "Unknown LLM provider"}
+
     def _generate_tool_decision_example(self, tools_description: str, example_tickers: list[str]) -> str:
         """Generate a dynamic example JSON for tool decisions based on available tools.
         
@@ -101,215 +663,350 @@ class LLMClient:
         Returns:
             JSON string with tool decision example
         """
-        # Extract tool names from description (format: "- tool_name [PAID/FREE]: description")
-        tool_names = []
-        for line in tools_description.split('\n'):
-            if line.strip().startswith('-'):
-                # Extract tool name between '-' and ':' or '[PAID]'/'[FREE]'
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    tool_name = parts[0].strip().lstrip('-').strip()
-                    # Remove [PAID] or [FREE] tags
-                    tool_name = tool_name.replace('[PAID]', '').replace('[FREE]', '').strip()
-                    # Remove price info like "$0.05/call"
-                    tool_name = tool_name.replace('$0.05/call', '').strip()
-                    if tool_name:
-                        tool_names.append(tool_name)
-        
-        # Build example with actual tools and tickers
-        if tool_names:
-            example_tools = [
-                {"tool": tool_names[0], "tickers": example_tickers}
-            ]
-            # Add second tool if available and we have at least 2 different tools
-            if len(tool_names) > 1:
-                example_tools.append({
-                    "tool": tool_names[1],
-                    "tickers": example_tickers if len(example_tickers) > 1 else example_tickers
-                })
-        else:
-            # Fallback if no tools found in description
-            example_tools = []
-        
-        return json.dumps({"tools": example_tools}, indent=2)
+        return _tool_decision_example_json(tools_description, tuple(example_tickers))
+
+    def _openai_complete(
+        self, prefix: str, suffix: str, max_tokens: int, model: str = OPENAI_MODEL
+    ) -> tuple[str, Dict[str, Any]]:
+        """Send one prompt to OpenAI; returns (response text, usage/provider metadata)."""
+        message = self._openai_client().chat.completions.create(
+            **_openai_request(prefix, suffix, max_tokens, model), extra_body=OPENAI_PROMPT_CACHE_BODY
+        )
+        return _openai_result(message, model)
+
+    def _anthropic_complete(
+        self, prefix: str, suffix: str, max_tokens: int, model: str = ANTHROPIC_MODEL
+    ) -> tuple[str, Dict[str, Any]]:
+        """Send one prompt to Anthropic; returns (response text, usage/provider metadata)."""
+        message = self._anthropic_client().messages.create(**_anthropic_request(prefix, suffix, max_tokens, model))
+        return _anthropic_result(message, model)
+
+    def _openai_batch(
+        self,
+        prompts: Dict[str, tuple[str, str]],
+        max_tokens: int,
+        poll_interval: float,
+        deadline: float | None = None,
+    ) -> Dict[str, Any]:
+        """Run prompts through the OpenAI Batch API; maps custom_id to (text, meta) or an exception."""
+        client = self._openai_client()
+        model = self.models["openai"]["reason"]
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {**_openai_request(prefix, suffix, max_tokens, model), **OPENAI_PROMPT_CACHE_BODY},
+            }, separators=(",", ":"))
+            for custom_id, (prefix, suffix) in prompts.items()
+        ]
+        batch_file = client.files.create(file=("summaries.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        while batch.status not in _OPENAI_BATCH_DONE:
+            if _batch_timed_out(deadline, poll_interval):
+                client.batches.cancel(batch.id)
+                raise TimeoutError(f"OpenAI batch {batch.id} did not finish in time; cancelled")
+            batch = client.batches.retrieve(batch.id)
+        if not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+
+        outcomes: Dict[str, Any] = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            # Attribute access lets the live-response helpers read the JSON body
+            entry = json.loads(line, object_hook=lambda fields: SimpleNamespace(**fields))
+            response = getattr(entry, "response", None)
+            if response is None or response.status_code != 200:
+                outcomes[entry.custom_id] = RuntimeError(str(getattr(entry, "error", None) or "batch request failed"))
+            else:
+                outcomes[entry.custom_id] = _openai_result(response.body, model)
+        return outcomes
+
+    def _anthropic_batch(
+        self,
+        prompts: Dict[str, tuple[str, str]],
+        max_tokens: int,
+        poll_interval: float,
+        deadline: float | None = None,
+    ) -> Dict[str, Any]:
+        """Run prompts through Anthropic Message Batches; maps custom_id to (text, meta) or an exception."""
+        batches = self._anthropic_client().messages.batches
+        model = self.models["anthropic"]["reason"]
+        batch = batches.create(requests=[
+            {"custom_id": custom_id, "params": _anthropic_request(prefix, suffix, max_tokens, model)}
+            for custom_id, (prefix, suffix) in prompts.items()
+        ])
+        while batch.processing_status != "ended":
+            if _batch_timed_out(deadline, poll_interval):
+                batches.cancel(batch.id)
+                raise TimeoutError(f"Anthropic batch {batch.id} did not finish in time; cancelled")
+            batch = batches.retrieve(batch.id)
+
+        outcomes: Dict[str, Any] = {}
+        for entry in batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                outcomes[entry.custom_id] = _anthropic_result(entry.result.message, model)
+            else:
+                outcomes[entry.custom_id] = RuntimeError(f"batch request {entry.result.type}")
+        return outcomes
+
+    def _openai_stream(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        on_text: Callable[[str], None],
+        model: str = OPENAI_MODEL,
+    ) -> tuple[str, Dict[str, Any]]:
+        """Stream one prompt from OpenAI, passing each text delta to ``on_text``."""
+        stream = self._openai_client().chat.completions.create(
+            **_openai_request(prefix, suffix, max_tokens, model),
+            stream=True,
+            stream_options={"include_usage": True},
+            extra_body=OPENAI_PROMPT_CACHE_BODY,
+        )
+        parts: list[str] = []
+        usage = None
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                on_text(parts[-1])
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+        tokens = _openai_usage(SimpleNamespace(usage=usage)) if usage is not None else dict(_ZERO_USAGE)
+        meta = {"llm_tokens": tokens, "llm_provider": "openai", "llm_model": model}
+        return "".join(parts).strip(), meta
+
+    def _anthropic_stream(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        on_text: Callable[[str], None],
+        model: str = ANTHROPIC_MODEL,
+    ) -> tuple[str, Dict[str, Any]]:
+        """Stream one prompt from Anthropic, passing each text delta to ``on_text``."""
+        with self._anthropic_client().messages.stream(**_anthropic_request(prefix, suffix, max_tokens, model)) as stream:
+            on_text(ANTHROPIC_JSON_PREFILL)
+            for text in stream.text_stream:
+                on_text(text)
+            message = stream.get_final_message()
+        return _anthropic_result(message, model)
+
+    def _complete(
+        self,
+        provider: str,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        on_text: Callable[[str], None] | None = None,
+        task: str = "reason",
+    ) -> tuple[str, Dict[str, Any]]:
+        """Complete a prompt with the provider's model for ``task``, serving
+        exact repeats from the in-memory response cache.
+
+        Cache hits report zero token usage (nothing was billed) and set
+        ``llm_cached``. Only successful responses are cached. Identical
+        prompts arriving while one is in flight wait for it and share its
+        response (or its error) instead of sending another request. With
+        ``on_text`` a live response is streamed to it; shared or cached
+        responses were not streamed and are only returned.
+        """
+        model = self.models[provider][task]
+        key = hashlib.sha256(
+            "\x00".join((provider, model, str(max_tokens), prefix, suffix)).encode("utf-8")
+        ).hexdigest()
+        cached = self._response_cache.get(key)
+        if cached is None:
+            with self._inflight_lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+            if not leader:
+                cached = future.result()
+        if cached is not None:
+            response_text, meta = cached
+            return response_text, {**meta, "llm_tokens": dict(_ZERO_USAGE), "llm_cached": True}
 
-    def _openai_summary(
+        try:
+            if on_text is not None:
+                stream = self._openai_stream if provider == "openai" else self._anthropic_stream
+                response_text, meta = stream(prefix, suffix, max_tokens, on_text, model)
+            elif provider == "openai":
+                response_text, meta = self._openai_complete(prefix, suffix, max_tokens, model)
+            else:
+                response_text, meta = self._anthropic_complete(prefix, suffix, max_tokens, model)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._response_cache.set(key, (response_text, meta))
+            future.set_result((response_text, meta))
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return response_text, meta
+
+    def _summary_with(
         self,
+        provider: str,
         query: str,
         tickers: list[str],
         tool_outputs: Dict[str, Any],
+        on_item: Callable[[str, str], None] | None = None,
     ) -> Dict[str, Any]:
-        """Generate summary using OpenAI API."""
         try:
-            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
-            prompt = f"""You are an investment research analyst. Analyze the following market data and generate a research summary.
-
-User Query: {query}
-Tickers: {', '.join(tickers)}
-
-Market Data:
-{json.dumps(tool_outputs, indent=2)}
-
-Generate a JSON response with:
-- thesis_bullets: list of 1-3 key insights about the tickers (string format)
-- risks: list of 0-2 key risks or concerns (string format)
-
-Respond with ONLY valid JSON, no markdown or extra text."""
-
-            message = client.chat.completions.create(
-                model="gpt-4o-mini",
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}],
+            prefix, suffix = self._summary_prompt(query, tickers, tool_outputs)
+            vector = namespace = None
+            if self._semantic_cache is not None:
+                # Only paraphrases over the same tickers and data may share a summary
+                data_key = hashlib.sha256(
+                    json.dumps(tool_outputs, sort_keys=True, default=str).encode("utf-8")
+                ).hexdigest()
+                namespace = ("summary", provider, tuple(sorted(tickers)), data_key)
+                vector, cached = self._semantic_lookup(namespace, query)
+                if cached is not None:
+                    return cached
+            on_text = None
+            if on_item is not None:
+                parser = _SummaryItemParser()
+
+                def on_text(fragment: str) -> None:
+                    for field, text in parser.feed(fragment):
+                        on_item(field, text)
+
+            response_text, meta = self._complete(
+                provider, prefix, suffix, max_tokens=SUMMARY_MAX_TOKENS, on_text=on_text
             )
-
-            response_text = message.choices[0].message.content.strip()
-            result = json.loads(response_text)
-
-            return {
-                "thesis_bullets": result.get("thesis_bullets", []),
-                "risks": result.get("risks", []),
-                "llm_tokens": {
-                    "input": message.usage.prompt_tokens,
-                    "output": message.usage.completion_tokens,
-                    "total": message.usage.total_tokens,
-                },
-                "llm_provider": "openai",
-                "llm_model": "gpt-4o-mini",
-            }
+            summary = _summary_from_text(response_text, meta)
+            if namespace is not None:
+                self._semantic_store(namespace, vector, summary)
+            return summary
         except Exception as e:
             return {"thesis_bullets": [], "risks": [], "llm_error": str(e)}
 
+    def _openai_summary(
+        self,
+        query: str,
+        tickers: list[str],
+        tool_outputs: Dict[str, Any],
+        on_item: Callable[[str, str], None] | None = None,
+    ) -> Dict[str, Any]:
+        """Generate summary using OpenAI API."""
+        return self._summary_with("openai", query, tickers, tool_outputs, on_item)
+
     def _anthropic_summary(
         self,
         query: str,
         tickers: list[str],
         tool_outputs: Dict[str, Any],
+        on_item: Callable[[str, str], None] | None = None,
     ) -> Dict[str, Any]:
         """Generate summary using Anthropic API (fallback)."""
-        try:
-            client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
-            prompt = f"""You are an investment research analyst. Analyze the following market data and generate a research summary.
-
-User Query: {query}
-Tickers: {', '.join(tickers)}
-
-Market Data:
-{json.dumps(tool_outputs, indent=2)}
-
-Generate a JSON response with:
-- thesis_bullets: list of 1-3 key insights about the tickers (string format)
-- risks: list of 0-2 key risks or concerns (string format)
-
-Respond with ONLY valid JSON, no markdown or extra text."""
+        return self._summary_with("anthropic", query, tickers, tool_outputs, on_item)
 
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = message.content[0].text.strip()
-            result = json.loads(response_text)
-
-            return {
-                "thesis_bullets": result.get("thesis_bullets", []),
-                "risks": result.get("risks", []),
-                "llm_tokens": {
-                    "input": message.usage.input_tokens,
-                    "output": message.usage.output_tokens,
-                    "total": message.usage.input_tokens + message.usage.output_tokens,
-                },
-                "llm_provider": "anthropic",
-                "llm_model": "claude-3-5-sonnet-20241022",
-            }
-        except Exception as e:
-            return {"thesis_bullets": [], "risks": [], "llm_error": str(e)}
-
-    def _openai_infer_tickers(self, query: str) -> Dict[str, Any]:
-        """Infer tickers using OpenAI API."""
+    def _infer_tickers_with(self, provider: str, query: str) -> Dict[str, Any]:
         try:
-            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
-            prompt = f"""Extract up to 5 likely stock or ETF tickers from the user query.
-
-User Query: {query}
-
-Rules:
-- Return ONLY a JSON object with a key "tickers".
-- Use uppercase ticker symbols only.
-- If no tickers are implied, return an empty list.
-
-Example:
-{{"tickers": ["NVDA", "AMD"]}}"""
-
-            message = client.chat.completions.create(
-                model="gpt-4o-mini",
+            response_text, meta = self._complete(
+                provider,
+                INFER_TICKERS_INSTRUCTIONS,
+                QUERY_TEMPLATE.format(query=query),
                 max_tokens=100,
-                messages=[{"role": "user", "content": prompt}],
+                task="extract",
             )
-
-            response_text = message.choices[0].message.content.strip()
-            result = json.loads(response_text)
-            tickers = result.get("tickers", [])
+            tickers = json.loads(response_text).get("tickers", [])
             if not isinstance(tickers, list):
                 tickers = []
-
-            return {
-                "tickers": tickers,
-                "llm_tokens": {
-                    "input": message.usage.prompt_tokens,
-                    "output": message.usage.completion_tokens,
-                    "total": message.usage.total_tokens,
-                },
-                "llm_provider": "openai",
-                "llm_model": "gpt-4o-mini",
-            }
+            return {"tickers": tickers, **meta}
         except Exception as e:
             return {"tickers": [], "llm_error": str(e)}
 
+    def _openai_infer_tickers(self, query: str) -> Dict[str, Any]:
+        """Infer tickers using OpenAI API."""
+        return self._infer_tickers_with("openai", query)
+
     def _anthropic_infer_tickers(self, query: str) -> Dict[str, Any]:
         """Infer tickers using Anthropic API."""
-        try:
-            client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
-            prompt = f"""Extract up to 5 likely stock or ETF tickers from the user query.
+        return self._infer_tickers_with("anthropic", query)
 
-User Query: {query}
-
-Rules:
-- Return ONLY a JSON object with a key "tickers".
-- Use uppercase ticker symbols only.
-- If no tickers are implied, return an empty list.
-
-Example:
-{{"tickers": ["NVDA", "AMD"]}}"""
+    def _summary_prompt(
+        self,
+        query: str,
+        tickers: list[str],
+        tool_outputs: Dict[str, Any],
+    ) -> tuple[str, str]:
+        """Build (stable prefix, volatile suffix) for summary generation."""
+        suffix = SUMMARY_REQUEST_TEMPLATE.format(
+            query=query,
+            tickers=", ".join(tickers),
+            data=json.dumps(_summary_tool_outputs(tool_outputs), separators=(",", ":"), default=str),
+        )
+        return SUMMARY_INSTRUCTIONS, suffix
+
+    def _decide_tools_prompt(
+        self,
+        query: str,
+        tickers: list[str],
+        tools_description: str,
+    ) -> tuple[str, str]:
+        """Build (stable prefix, volatile suffix) for tool routing."""
+        # Generate dynamic example based on available tickers (limit to 3 for brevity)
+        example_tickers = tickers[:3] if len(tickers) > 0 else ["EXAMPLE"]
+        example_json = self._generate_tool_decision_example(tools_description, example_tickers)
+        prefix = DECIDE_TOOLS_TEMPLATE.format(tools_description=tools_description)
+        suffix = DECIDE_TOOLS_REQUEST_TEMPLATE.format(
+            query=query, tickers=", ".join(tickers), example_json=example_json
+        )
+        return prefix, suffix
+
+    def _plan_prompt(self, query: str, tools_description: str) -> tuple[str, str]:
+        """Build (stable prefix, volatile suffix) for batched ticker inference + tool routing."""
+        example_json = self._generate_tool_decision_example(tools_description, ["NVDA", "AMD"])
+        prefix = PLAN_RESEARCH_TEMPLATE.format(tools_description=tools_description, example_json=example_json)
+        return prefix, QUERY_TEMPLATE.format(query=query)
+
+    def _parse_plan_response(self, response_text: str) -> Dict[str, Any]:
+        """Parse batched plan JSON into cleaned ticker and tool lists."""
+        result = json.loads(response_text)
+        tickers = result.get("tickers", [])
+        if not isinstance(tickers, list):
+            tickers = []
+        return {"tickers": tickers, "tools": _clean_tool_decisions(result.get("tools", []))}
+
+    def _plan_research_with(self, provider: str, query: str, tools_description: str) -> Dict[str, Any]:
+        try:
+            prefix, suffix = self._plan_prompt(query, tools_description)
+            response_text, meta = self._complete(provider, prefix, suffix, max_tokens=400, task="extract")
+            return {**self._parse_plan_response(response_text), **meta}
+        except Exception as e:
+            return {"tickers": [], "tools": [], "llm_error": str(e)}
 
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=100,
-                messages=[{"role": "user", "content": prompt}],
-            )
+    def _openai_plan_research(self, query: str, tools_description: str) -> Dict[str, Any]:
+        """Infer tickers and route tools using OpenAI API."""
+        return self._plan_research_with("openai", query, tools_description)
 
-            response_text = message.content[0].text.strip()
-            result = json.loads(response_text)
-            tickers = result.get("tickers", [])
-            if not isinstance(tickers, list):
-                tickers = []
+    def _anthropic_plan_research(self, query: str, tools_description: str) -> Dict[str, Any]:
+        """Infer tickers and route tools using Anthropic API."""
+        return self._plan_research_with("anthropic", query, tools_description)
 
-            return {
-                "tickers": tickers,
-                "llm_tokens": {
-                    "input": message.usage.input_tokens,
-                    "output": message.usage.output_tokens,
-                    "total": message.usage.input_tokens + message.usage.output_tokens,
-                },
-                "llm_provider": "anthropic",
-                "llm_model": "claude-3-5-sonnet-20241022",
-            }
+    def _decide_tools_with(
+        self,
+        provider: str,
+        query: str,
+        tickers: list[str],
+        tools_description: str,
+    ) -> Dict[str, Any]:
+        try:
+            prefix, suffix = self._decide_tools_prompt(query, tickers, tools_description)
+            response_text, meta = self._complete(provider, prefix, suffix, max_tokens=300, task="extract")
+            tools = _clean_tool_decisions(json.loads(response_text).get("tools", []))
+            return {"tools": tools, **meta}
         except Exception as e:
-            return {"tickers": [], "llm_error": str(e)}
+            return {"tools": [], "llm_error": str(e)}
 
     def _openai_decide_tools(
         self,
@@ -318,64 +1015,7 @@ Example:
         tools_description: str,
     ) -> Dict[str, Any]:
         """Decide which tools to invoke using OpenAI API."""
-        try:
-            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
-            # Generate dynamic example based on available tickers (limit to 3 for brevity)
-            example_tickers = tickers[:3] if len(tickers) > 0 else ["EXAMPLE"]
-            example_json = self._generate_tool_decision_example(tools_description, example_tickers)
-
-            prompt = f"""You are an investment research agent. Given a user query and available tools, decide which tools to invoke.
-
-User Query: {query}
-Tickers to Analyze: {', '.join(tickers)}
-
-Available Tools:
-{tools_description}
-
-For each relevant tool, specify which tickers it should be called for. Return ONLY a JSON object:
-{example_json}
-
-Rules:
-- Include only relevant tools for the query
-- You can call same tool for different ticker subsets if needed
-- Return empty list if no tools are relevant
-- Use ticker symbols from the provided list only"""
-
-            message = client.chat.completions.create(
-                model="gpt-4o-mini",
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = message.choices[0].message.content.strip()
-            result = json.loads(response_text)
-            tools = result.get("tools", [])
-            if not isinstance(tools, list):
-                tools = []
-            
-            # Clean tool names by removing [PAID]/[FREE] tags and price labels
-            for tool in tools:
-                if isinstance(tool, dict) and "tool" in tool:
-                    tool_name = tool["tool"]
-                    # Remove [PAID] or [FREE] tags
-                    tool_name = tool_name.replace('[PAID]', '').replace('[FREE]', '').strip()
-                    # Remove price info like "$0.05/call"
-                    tool_name = tool_name.rsplit('$', 1)[0].strip() if '$' in tool_name else tool_name
-                    tool["tool"] = tool_name
-
-            return {
-                "tools": tools,
-                "llm_tokens": {
-                    "input": message.usage.prompt_tokens,
-                    "output": message.usage.completion_tokens,
-                    "total": message.usage.total_tokens,
-                },
-                "llm_provider": "openai",
-                "llm_model": "gpt-4o-mini",
-            }
-        except Exception as e:
-            return {"tools": [], "llm_error": str(e)}
+        return self._decide_tools_with("openai", query, tickers, tools_description)
 
     def _anthropic_decide_tools(
         self,
@@ -384,62 +1024,4 @@ Rules:
         tools_description: str,
     ) -> Dict[str, Any]:
         """Decide which tools to invoke using Anthropic API."""
-        try:
-            client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
-            # Generate dynamic example based on available tickers (limit to 3 for brevity)
-            example_tickers = tickers[:3] if len(tickers) > 0 else ["EXAMPLE"]
-            example_json = self._generate_tool_decision_example(tools_description, example_tickers)
-
-            prompt = f"""You are an investment research agent. Given a user query and available tools, decide which tools to invoke.
-
-User Query: {query}
-Tickers to Analyze: {', '.join(tickers)}
-
-Available Tools:
-{tools_description}
-
-For each relevant tool, specify which tickers it should be called for. Return ONLY a JSON object:
-{example_json}
-
-Rules:
-- Include only relevant tools for the query
-- You can call same tool for different ticker subsets if needed
-- Return empty list if no tools are relevant
-- Use ticker symbols from the provided list only"""
-
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = message.content[0].text.strip()
-            result = json.loads(response_text)
-            tools = result.get("tools", [])
-            if not isinstance(tools, list):
-                tools = []
-            
-            # Clean tool names by removing [PAID]/[FREE] tags and price labels
-            for tool in tools:
-                if isinstance(tool, dict) and "tool" in tool:
-                    tool_name = tool["tool"]
-                    # Remove [PAID] or [FREE] tags
-                    tool_name = tool_name.replace('[PAID]', '').replace('[FREE]', '').strip()
-                    # Remove price info like "$0.05/call"
-                    tool_name = tool_name.rsplit('$', 1)[0].strip() if '$' in tool_name else tool_name
-                    tool["tool"] = tool_name
-
-            return {
-                "tools": tools,
-                "llm_tokens": {
-                    "input": message.usage.input_tokens,
-                    "output": message.usage.output_tokens,
-                    "total": message.usage.input_tokens + message.usage.output_tokens,
-                },
-                "llm_provider": "anthropic",
-                "llm_model": "claude-3-5-sonnet-20241022",
-            }
-        except Exception as e:
-            return {"tools": [], "llm_error": str(e)}
-
+        return self._decide_tools_with("anthropic", query, tickers, tools_description)
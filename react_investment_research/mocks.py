@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from importlib import resources
 
 
-def _load_json(name: str) -> Dict[str, Any] | None:
+@lru_cache(maxsize=256)
+def _read_mock(name: str) -> str | None:
     try:
-        path = resources.files("react_investment_research.data.mocks").joinpath(name)
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return resources.files("react_investment_research.data.mocks").joinpath(name).read_text(encoding="utf-8")
     except FileNotFoundError:
         return None
 
 
+def _load_json(name: str) -> Dict[str, Any] | None:
+    # The file text is cached; parsing per call hands every caller its own
+    # mutable dict (payloads are validated, merged and serialized downstream)
+    text = _read_mock(name)
+    return json.loads(text) if text is not None else None
+
+
 def market_snapshot(
     ticker: str,
     period: str,
@@ -41,6 +48,19 @@ def fundamentals_events(
     return payload
 
 
+_MOCK_SENTIMENT: Dict[str, Dict[str, Any]] | None = None
+
+
+def _mock_sentiment_data() -> Dict[str, Dict[str, Any]]:
+    """MOCK_SENTIMENT_DATA from the sentiment tool, resolved on first use."""
+    global _MOCK_SENTIMENT
+    if _MOCK_SENTIMENT is None:
+        from .tools.sentiment_analysis import MOCK_SENTIMENT_DATA
+
+        _MOCK_SENTIMENT = MOCK_SENTIMENT_DATA
+    return _MOCK_SENTIMENT
+
+
 def sentiment_analysis(
     ticker: str,
     lookback_days: int = 30,
@@ -49,10 +69,9 @@ def sentiment_analysis(
     
     Uses the built-in MOCK_SENTIMENT_DATA from the sentiment_analysis tool.
     """
-    from .tools.sentiment_analysis import MOCK_SENTIMENT_DATA
-    
+    mock_sentiment = _mock_sentiment_data()
     ticker = ticker.upper()
-    if ticker not in MOCK_SENTIMENT_DATA:
+    if ticker not in mock_sentiment:
         # Return neutral sentiment for unknown tickers
         return {
             "ticker": ticker,
@@ -75,9 +94,5 @@ def sentiment_analysis(
             "lookback_days": lookback_days,
         }
     
-    # Return mock data, adding the asof field
-    mock_data = MOCK_SENTIMENT_DATA[ticker].copy()
-    mock_data["ticker"] = ticker
-    mock_data["asof"] = "2026-02-14"
-    mock_data["lookback_days"] = lookback_days
-    return mock_data
+    # Return mock data, adding the request fields
+    return {**mock_sentiment[ticker], "ticker": ticker, "asof": "2026-02-14", "lookback_days": lookback_days}
@@ -0,0 +1,61 @@
+"""Interactive loop that answers repeated queries with one warm agent.
+
+Usage: python -m react_investment_research.repl [--offline] [--use-llm]
+Each input line is ``query | TICKER,TICKER | period``; tickers and period are optional.
+With an LLM, summary bullets are printed to stderr as they stream in, before
+the JSON result is written to stdout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional, Tuple
+
+from .cli import parse_csv, write_json
+from .server import get_agent
+
+
+def _parse_line(line: str) -> Tuple[str, List[str], str]:
+    parts = [part.strip() for part in line.split("|")]
+    query = parts[0]
+    tickers = [t.upper() for t in parse_csv(parts[1])] if len(parts) > 1 else []
+    period = parts[2] if len(parts) > 2 and parts[2] else "3mo"
+    return query, tickers, period
+
+
+_ITEM_LABELS = {"thesis_bullets": "thesis", "risks": "risk"}
+
+
+def _print_summary_item(field: str, text: str) -> None:
+    print(f"  {_ITEM_LABELS.get(field, field)}: {text}", file=sys.stderr, flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Interactive ReAct investment research session")
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--use-llm", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="Reuse live tool results from the on-disk cache")
+    args = parser.parse_args(argv)
+
+    agent = get_agent(
+        offline=args.offline,
+        use_llm=args.use_llm,
+        track_costs=False,
+        use_cache=args.cache,
+    )
+    while True:
+        try:
+            line = input("query> ").strip()
+        except EOFError:
+            break
+        if not line:
+            continue
+        if line in {"exit", "quit"}:
+            break
+        query, tickers, period = _parse_line(line)
+        write_json(agent.run(query=query, tickers=tickers, period=period, on_summary_item=_print_summary_item))
+
+
+if __name__ == "__main__":
+    main()
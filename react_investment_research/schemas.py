@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from jsonschema import Draft7Validator
 
@@ -140,6 +141,8 @@ FINAL_OUTPUT_SCHEMA: Dict[str, Any] = {
         },
         "tickers_source": {"type": "string"},
         "tickers_inferred": {"type": "array", "items": {"type": "string"}},
+        # Tool payloads are validated individually in ResearchAgent._call_tool,
+        # so these subtrees stay opaque here and are not traversed again.
         "fundamentals": {
             "type": "object",
             "additionalProperties": True,
@@ -185,10 +188,48 @@ SCHEMAS: Dict[str, Dict[str, Any]] = {
 }
 
 
-def validate_schema(name: str, payload: Dict[str, Any]) -> Tuple[bool, str | None]:
+@lru_cache(maxsize=None)
+def get_validator(name: str) -> Draft7Validator:
+    """Return the compiled validator for a named schema, built once per process.
+
+    The schema itself is meta-validated here, once, so a malformed schema
+    fails loudly on first use instead of mis-validating payloads.
+    """
     schema = SCHEMAS[name]
-    validator = Draft7Validator(schema)
-    errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
-    if errors:
-        return False, errors[0].message
-    return True, None
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema)
+
+
+@lru_cache(maxsize=None)
+def get_branch_validators(name: str) -> Optional[Tuple[Draft7Validator, Draft7Validator]]:
+    """(success, error) validators for an ``anyOf`` of a payload and an error object.
+
+    Only the error branch requires ``"error"`` and the success branch forbids
+    extra keys, so the key alone decides which branch can match. Returns None
+    for schemas without that shape.
+    """
+    branches = SCHEMAS[name].get("anyOf")
+    if not branches or len(branches) != 2:
+        return None
+    error_branches = [branch for branch in branches if "error" in branch.get("required", ())]
+    success_branches = [
+        branch for branch in branches
+        if branch.get("additionalProperties") is False and "error" not in branch.get("properties", {})
+    ]
+    if len(error_branches) != 1 or len(success_branches) != 1:
+        return None
+    return Draft7Validator(success_branches[0]), Draft7Validator(error_branches[0])
+
+
+def validate_schema(name: str, payload: Dict[str, Any]) -> Tuple[bool, str | None]:
+    validator = get_validator(name)
+    branch_validators = get_branch_validators(name)
+    if branch_validators is not None and isinstance(payload, dict):
+        # Validate against the one branch that can match instead of trying both
+        validator = branch_validators[1] if "error" in payload else branch_validators[0]
+    # One traversal that stops at the first error; valid payloads never
+    # collect or order errors
+    first_error = next(validator.iter_errors(payload), None)
+    if first_error is None:
+        return True, None
+    return False, first_error.message
@@ -0,0 +1,48 @@
+"""Process-wide ResearchAgent reuse for long-running callers (REPL, servers, notebooks)."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+
+from .agent import ResearchAgent
+
+
+@lru_cache(maxsize=8)
+def _cached_agent(
+    offline: bool,
+    use_llm: bool,
+    track_costs: bool,
+    tools_key: Optional[FrozenSet[str]],
+    use_cache: bool,
+) -> ResearchAgent:
+    available_tools = sorted(tools_key) if tools_key is not None else None
+    return ResearchAgent(
+        offline=offline,
+        use_llm=use_llm,
+        track_costs=track_costs,
+        available_tools=available_tools,
+        use_cache=use_cache,
+    )
+
+
+def get_agent(
+    offline: bool = False,
+    use_llm: bool = True,
+    track_costs: bool = True,
+    available_tools: Optional[Iterable[str]] = None,
+    use_cache: bool = False,
+) -> ResearchAgent:
+    """Return a shared agent for this configuration, constructing it on first use.
+
+    The LLM client, data provider and tool registries are built once per
+    configuration and reused by later calls. Invalid tool names raise
+    ValueError on every call; failed constructions are not cached.
+    """
+    tools_key = frozenset(available_tools) if available_tools is not None else None
+    return _cached_agent(offline, use_llm, track_costs, tools_key, use_cache)
+
+
+def clear_agents() -> None:
+    """Drop all shared agents (e.g. after changing API keys in the environment)."""
+    _cached_agent.cache_clear()
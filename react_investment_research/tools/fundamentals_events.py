@@ -4,6 +4,27 @@ from typing import Any, Dict, List, Optional
 
 from .providers import YFinanceProvider
 
+# Tool schemas for the registry
+FUNDAMENTALS_EVENTS_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "ticker": {"type": "string"},
+        "fields": {"type": "array"},
+        "include_calendar": {"type": "boolean"},
+        "lookback_days": {"type": "integer"},
+    },
+    "required": ["ticker"],
+}
+
+FUNDAMENTALS_EVENTS_OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "ticker": {"type": "string"},
+        "fundamentals": {"type": "object"},
+        "calendar": {"type": "array"},
+    },
+}
+
 ALLOWLIST_FIELDS = {
     "marketCap",
     "trailingPE",
@@ -18,6 +39,9 @@ ALLOWLIST_FIELDS = {
     "industry",
 }
 
+# Default selection, in a stable order, computed once
+_ALLOWLIST_SORTED = tuple(sorted(ALLOWLIST_FIELDS))
+
 
 def fundamentals_events(
     ticker: str,
@@ -44,8 +68,8 @@ def fundamentals_events(
     if not info:
         return {"error": "NO_DATA", "ticker": ticker, "reason": "invalid ticker or empty history"}
 
-    selected = sorted(ALLOWLIST_FIELDS) if not fields else fields
-    fundamentals = {key: info.get(key) for key in selected if key in ALLOWLIST_FIELDS}
+    selected = _ALLOWLIST_SORTED if not fields else [key for key in fields if key in ALLOWLIST_FIELDS]
+    fundamentals = {key: info.get(key) for key in selected}
 
     return {
         "ticker": ticker,
@@ -1,12 +1,41 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from .providers import YFinanceProvider
 
+# Tool schemas for the registry
+MARKET_SNAPSHOT_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "ticker": {"type": "string"},
+        "period": {"type": "string"},
+        "interval": {"type": "string"},
+        "benchmarks": {"type": "array"},
+    },
+    "required": ["ticker", "period"],
+}
+
+MARKET_SNAPSHOT_OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "ticker": {"type": "string"},
+        "period": {"type": "string"},
+        "prices": {"type": "object"},
+        "trend": {"type": "object"},
+        "risk": {"type": "object"},
+        "volume": {"type": "object"},
+    },
+}
+
+
+# Upper bound on concurrent OHLCV downloads per snapshot (ticker + benchmarks)
+_MAX_FETCH_WORKERS = 8
+
 
 def _trend_label(sma_20: float, sma_50: float) -> str:
     if sma_20 > sma_50 * 1.01:
@@ -16,6 +45,39 @@ def _trend_label(sma_20: float, sma_50: float) -> str:
     return "sideways"
 
 
+def _fetch_ohlcv(
+    provider: YFinanceProvider, ticker: str, period: str, interval: str
+) -> Optional[pd.DataFrame]:
+    try:
+        return provider.get_ohlcv(ticker, period, interval)
+    except Exception:
+        return None
+
+
+def _numeric_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """One OHLCV column as a float Series without missing values.
+
+    yfinance may return a one-column frame per field (multi-ticker column
+    index), hence the squeeze. Float columns, the usual case, skip the
+    element-wise numeric coercion.
+    """
+    column = df[name]
+    if isinstance(column, pd.DataFrame):
+        column = column.squeeze(axis=1)
+    if not isinstance(column, pd.Series):
+        raise TypeError(f"{name} is not a column")
+    if column.dtype.kind != "f":
+        column = pd.to_numeric(column, errors="coerce")
+    return column.dropna()
+
+
+def _tail_mean(values: np.ndarray, window: int) -> float:
+    """Mean of the last ``window`` values (the last rolling-window mean), or of all if shorter."""
+    if values.size == 0:
+        return float("nan")
+    return float(values[-window:].mean())
+
+
 def _compute_return_pct(series: pd.Series) -> float:
     if series.empty:
         return 0.0
@@ -34,68 +96,84 @@ def market_snapshot(
     provider: Optional[YFinanceProvider] = None,
 ) -> Dict[str, Any]:
     provider = provider or YFinanceProvider()
-    try:
-        df = provider.get_ohlcv(ticker, period, interval)
-    except Exception:
-        df = pd.DataFrame()
+    bench_frames: List[Tuple[str, Optional[pd.DataFrame]]] = []
+    if benchmarks:
+        # Network-bound: fetch the ticker and every benchmark concurrently
+        with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(benchmarks) + 1)) as executor:
+            primary = executor.submit(_fetch_ohlcv, provider, ticker, period, interval)
+            bench_futures = [
+                (bench, executor.submit(_fetch_ohlcv, provider, bench, period, interval)) for bench in benchmarks
+            ]
+            df = primary.result()
+            bench_frames = [(bench, future.result()) for bench, future in bench_futures]
+    else:
+        df = _fetch_ohlcv(provider, ticker, period, interval)
 
     if df is None or df.empty:
         return {"error": "NO_DATA", "ticker": ticker, "reason": "invalid ticker or empty history"}
 
     try:
-        close = pd.to_numeric(df["Close"].squeeze(), errors="coerce").dropna()
-        high = pd.to_numeric(df["High"].squeeze(), errors="coerce").dropna()
-        low = pd.to_numeric(df["Low"].squeeze(), errors="coerce").dropna()
-        volume = pd.to_numeric(df["Volume"].squeeze(), errors="coerce").dropna()
+        close = _numeric_column(df, "Close")
+        high = _numeric_column(df, "High")
+        low = _numeric_column(df, "Low")
+        volume = _numeric_column(df, "Volume")
     except Exception:
         return {"error": "NO_DATA", "ticker": ticker, "reason": "data parsing failed"}
 
     if close.empty or high.empty or low.empty or volume.empty:
         return {"error": "NO_DATA", "ticker": ticker, "reason": "insufficient data after parsing"}
 
-    start = float(close.iloc[0])
-    end = float(close.iloc[-1])
+    # Every statistic reads a short tail or one pass over the history, so work
+    # on plain arrays rather than building pandas rolling windows
+    close_a = close.to_numpy(dtype=np.float64)
+    volume_a = volume.to_numpy(dtype=np.float64)
+
+    start = float(close_a[0])
+    end = float(close_a[-1])
     return_pct = _compute_return_pct(close)
 
-    cummax = close.cummax()
-    drawdowns = (close / cummax - 1.0) * 100.0
-    max_drawdown_pct = float(drawdowns.min())
-
-    returns = close.pct_change().dropna()
-    volatility_ann_pct = float(returns.std() * np.sqrt(252) * 100.0) if not returns.empty else 0.0
-
-    prev_close = close.shift(1)
-    tr = pd.concat(
-        [
-            (high - low).abs(),
-            (high - prev_close).abs(),
-            (low - prev_close).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
-    atr_14 = float(tr.rolling(14).mean().iloc[-1]) if len(tr) >= 14 else float(tr.mean())
-
-    sma_20 = float(close.rolling(20).mean().iloc[-1]) if len(close) >= 20 else float(close.mean())
-    sma_50 = float(close.rolling(50).mean().iloc[-1]) if len(close) >= 50 else float(close.mean())
+    # Scale only the worst ratio rather than the whole drawdown series
+    max_drawdown_pct = (float((close_a / np.maximum.accumulate(close_a)).min()) - 1.0) * 100.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(close_a) / close_a[:-1]
+    returns = returns[~np.isnan(returns)]
+    volatility_ann_pct = float(returns.std(ddof=1) * np.sqrt(252) * 100.0) if returns.size >= 2 else 0.0
+
+    # True range on the rows where high, low and close are all present; only
+    # histories with gaps in some column need an index join to line them up
+    if close.index.equals(high.index) and close.index.equals(low.index):
+        high_a, low_a, hlc_close = high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64), close_a
+    else:
+        hlc = pd.concat([high, low, close], axis=1, join="inner").to_numpy(dtype=np.float64)
+        high_a, low_a, hlc_close = hlc[:, 0], hlc[:, 1], hlc[:, 2]
+    tr = np.abs(high_a - low_a)
+    if tr.size > 1:
+        prev_close = hlc_close[:-1]
+        tr[1:] = np.maximum(
+            tr[1:], np.maximum(np.abs(high_a[1:] - prev_close), np.abs(low_a[1:] - prev_close))
+        )
+    atr_14 = _tail_mean(tr, 14)
+
+    sma_20 = _tail_mean(close_a, 20)
+    sma_50 = _tail_mean(close_a, 50)
     trend_label = _trend_label(sma_20, sma_50)
 
-    avg_20d = float(volume.rolling(20).mean().iloc[-1]) if len(volume) >= 20 else float(volume.mean())
-    latest_vol = float(volume.iloc[-1])
-    vol_window = volume.tail(20)
-    vol_std = float(vol_window.std()) if len(vol_window) >= 2 else 0.0
+    avg_20d = _tail_mean(volume_a, 20)
+    latest_vol = float(volume_a[-1])
+    vol_window = volume_a[-20:]
+    vol_std = float(vol_window.std(ddof=1)) if vol_window.size >= 2 else 0.0
     zscore_latest = float((latest_vol - vol_window.mean()) / vol_std) if vol_std else 0.0
 
     relative: List[Dict[str, Any]] = []
-    if benchmarks:
-        for bench in benchmarks:
-            try:
-                bench_df = provider.get_ohlcv(bench, period, interval)
-                if bench_df is None or bench_df.empty:
-                    continue
-                bench_return = _compute_return_pct(bench_df["Close"].astype(float))
-                relative.append({"ticker": bench, "return_pct": bench_return})
-            except Exception:
-                continue
+    for bench, bench_df in bench_frames:
+        if bench_df is None or bench_df.empty:
+            continue
+        try:
+            bench_return = _compute_return_pct(bench_df["Close"].astype(float))
+        except Exception:
+            continue
+        relative.append({"ticker": bench, "return_pct": bench_return})
 
     asof = df.index[-1].date().isoformat() if hasattr(df.index[-1], "date") else str(df.index[-1])
 
@@ -1,14 +1,46 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import pandas as pd
-import yfinance as yf
+
+from ..cache import MemoryCache
+
+# Tools build a fresh provider per call, so fetched data is shared at module
+# level: a benchmark or fundamentals lookup repeated within a few minutes
+# (several tickers benchmarked against SPY, say) is served from memory.
+# Empty responses are not cached: they usually mean a transient yfinance
+# failure, and caching one would keep a valid ticker looking invalid.
+PROVIDER_CACHE_SIZE = 256
+PROVIDER_CACHE_TTL_SECONDS = 300
+_PROVIDER_CACHE = MemoryCache(PROVIDER_CACHE_SIZE, PROVIDER_CACHE_TTL_SECONDS)
+
+
+def clear_provider_cache() -> None:
+    """Drop all memoized provider responses."""
+    _PROVIDER_CACHE.clear()
+
+
+def _yf():
+    # yfinance is imported on first use so offline runs never pay its import cost
+    import yfinance
+
+    return yfinance
 
 
 class YFinanceProvider:
     def get_ohlcv(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
-        data = yf.download(
+        key = ("ohlcv", ticker, period, interval)
+        cached = _PROVIDER_CACHE.get(key)
+        if cached is None:
+            cached = self._download_ohlcv(ticker, period, interval)
+            if not cached.empty:
+                _PROVIDER_CACHE.set(key, cached)
+        # Callers get their own frame so the cached one cannot be mutated
+        return cached.copy()
+
+    def _download_ohlcv(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+        data = _yf().download(
             ticker,
             period=period,
             interval=interval,
@@ -20,11 +52,53 @@ class YFinanceProvider:
         return data.dropna()
 
     def get_info(self, ticker: str) -> Dict[str, Any]:
-        info = yf.Ticker(ticker).info
-        return info or {}
+        key = ("info", ticker)
+        cached = _PROVIDER_CACHE.get(key)
+        if cached is None:
+            cached = _yf().Ticker(ticker).info or {}
+            if cached:
+                _PROVIDER_CACHE.set(key, cached)
+        return dict(cached)
+
+    def get_quotes_batch(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch recent closes for many tickers in one download.
+
+        Returns a mapping of every requested ticker to ``{"symbol", "close"}``,
+        or ``{}`` when Yahoo has no recent data for it.
+        """
+        quotes: Dict[str, Dict[str, Any]] = {ticker: {} for ticker in tickers}
+        if not tickers:
+            return quotes
+        data = _yf().download(
+            list(tickers),
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+        )
+        if data is None or data.empty:
+            return quotes
+        for ticker in tickers:
+            try:
+                close = data[ticker]["Close"].dropna()
+            except KeyError:
+                continue
+            if not close.empty:
+                quotes[ticker] = {"symbol": ticker, "close": float(close.iloc[-1])}
+        return quotes
 
     def get_calendar(self, ticker: str) -> Dict[str, Any]:
-        calendar = yf.Ticker(ticker).calendar
+        key = ("calendar", ticker)
+        cached = _PROVIDER_CACHE.get(key)
+        if cached is None:
+            cached = self._fetch_calendar(ticker)
+            if cached:
+                _PROVIDER_CACHE.set(key, cached)
+        return dict(cached)
+
+    def _fetch_calendar(self, ticker: str) -> Dict[str, Any]:
+        calendar = _yf().Ticker(ticker).calendar
         if calendar is None:
             return {}
         if isinstance(calendar, dict):
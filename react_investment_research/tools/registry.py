@@ -1,10 +1,11 @@
 """Tool Registry Pattern: Dynamic tool management and LLM-driven routing."""
 
+import bisect
 from dataclasses import dataclass, field
 from typing import Any, Callable, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Tool:
     """Specification for a tool available to the agent.
     
@@ -28,6 +29,8 @@ class Tool:
     budget_per_ticker: int = 1
     is_paid: bool = False
     pricing_usd_per_call: float = 0.0
+    # Rendered once in __post_init__; the spec is frozen after creation
+    _prompt_description: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate tool specification."""
@@ -43,13 +46,18 @@ class Tool:
             raise ValueError(f"budget_per_ticker must be >= 1, got {self.budget_per_ticker}")
         if self.is_paid and self.pricing_usd_per_call <= 0:
             raise ValueError(f"Paid tools must have pricing_usd_per_call > 0, got {self.pricing_usd_per_call}")
+        examples_str = "\n  ".join(self.usage_examples) if self.usage_examples else "None"
+        paid_marker = " [PAID]" if self.is_paid else ""
+        object.__setattr__(
+            self,
+            "_prompt_description",
+            f"""- {self.name}{paid_marker}: {self.description}
+  Example usage: {examples_str}""",
+        )
 
     def to_prompt_description(self) -> str:
         """Format tool spec for LLM prompt."""
-        examples_str = "\n  ".join(self.usage_examples) if self.usage_examples else "None"
-        paid_marker = " [PAID]" if self.is_paid else ""
-        return f"""- {self.name}{paid_marker}: {self.description}
-  Example usage: {examples_str}"""
+        return self._prompt_description
 
 
 class ToolRegistry:
@@ -58,6 +66,10 @@ class ToolRegistry:
     def __init__(self):
         """Initialize empty tool registry."""
         self._tools: dict[str, Tool] = {}
+        self._prompt_description: Optional[str] = None
+        # Maintained in register() so the per-query getters do no traversal
+        self._total_budget = 0
+        self._names_sorted: list[str] = []
 
     def register(self, tool: Tool) -> None:
         """Register a new tool.
@@ -71,6 +83,9 @@ class ToolRegistry:
         if tool.name in self._tools:
             raise ValueError(f"Tool '{tool.name}' already registered")
         self._tools[tool.name] = tool
+        self._prompt_description = None
+        self._total_budget += tool.budget_per_ticker
+        bisect.insort(self._names_sorted, tool.name)
 
     def get(self, name: str) -> Optional[Tool]:
         """Get tool by name.
@@ -97,7 +112,7 @@ class ToolRegistry:
         Returns:
             Sorted list of tool names
         """
-        return sorted(self._tools.keys())
+        return list(self._names_sorted)
 
     def get_total_budget_per_ticker(self) -> int:
         """Calculate total budget across all tools per ticker.
@@ -105,7 +120,7 @@ class ToolRegistry:
         Returns:
             Sum of budget_per_ticker for all registered tools
         """
-        return sum(tool.budget_per_ticker for tool in self._tools.values())
+        return self._total_budget
 
     def get_available_tool_names(self) -> dict[str, dict]:
         """Get all registered tool names with metadata for CLI display.
@@ -160,20 +175,26 @@ class ToolRegistry:
             raise ValueError(f"Invalid tool(s) requested: {invalid}. Available: {self.list_names()}")
         
         new_registry = ToolRegistry()
-        for tool_name in valid:
-            new_registry._tools[tool_name] = self._tools[tool_name]
+        for tool_name in dict.fromkeys(valid):
+            new_registry.register(self._tools[tool_name])
         return new_registry
 
     def to_prompt_description(self) -> str:
         """Format all tools for LLM prompt.
         
+        Built once and reused until the registry changes, so repeated
+        prompts share an identical tool-description prefix.
+        
         Returns:
             Formatted string listing tool descriptions for LLM
         """
-        if not self._tools:
-            return "No tools available"
-        descriptions = [tool.to_prompt_description() for tool in self._tools.values()]
-        return "\n".join(descriptions)
+        if self._prompt_description is None:
+            if not self._tools:
+                self._prompt_description = "No tools available"
+            else:
+                descriptions = [tool.to_prompt_description() for tool in self._tools.values()]
+                self._prompt_description = "\n".join(descriptions)
+        return self._prompt_description
 
     def __repr__(self) -> str:
         """String representation of registry."""
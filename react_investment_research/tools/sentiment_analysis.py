@@ -9,7 +9,6 @@ import os
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
-import requests
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,6 +16,14 @@ load_dotenv()
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
 
+def _requests():
+    # requests (and urllib3) is imported only when NewsAPI is actually called,
+    # so mock and offline sentiment lookups never pay its import cost
+    import requests
+
+    return requests
+
+
 # Mock sentiment data for testing
 MOCK_SENTIMENT_DATA = {
     "NVDA": {
@@ -139,7 +146,8 @@ def _get_newsapi_sentiment(ticker: str) -> Optional[dict]:
     if not NEWS_API_KEY:
         # No API key configured, return None to use mock data
         return None
-    
+
+    requests = _requests()
     try:
         # Fetch articles about the ticker
         url = "https://newsapi.org/v2/everything"
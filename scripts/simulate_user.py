@@ -1,8 +1,8 @@
 import argparse
-import json
 import sys
 
 from react_investment_research.agent import ResearchAgent
+from react_investment_research.cli import parse_csv, write_json
 from react_investment_research.schemas import validate_schema
 
 
@@ -13,15 +13,15 @@ def main() -> int:
     parser.add_argument("--period", default="3mo")
     args = parser.parse_args()
 
-    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    tickers = [t.upper() for t in parse_csv(args.tickers)]
     agent = ResearchAgent(offline=True)
     output = agent.run(query=args.query, tickers=tickers, period=args.period)
     ok, error = validate_schema("final_output", output)
     if not ok:
-        print(json.dumps({"error": "INVALID_OUTPUT", "reason": error}, ensure_ascii=True))
+        write_json({"error": "INVALID_OUTPUT", "reason": error})
         return 1
 
-    print(json.dumps(output, ensure_ascii=True))
+    write_json(output)
     return 0
 
 
@@ -2,8 +2,11 @@
 import os
 from pathlib import Path
 
+import pytest
 from dotenv import load_dotenv
 
+from react_investment_research.tools.providers import clear_provider_cache
+
 # Load .env from project root
 env_path = Path(__file__).parents[1] / ".env"
 if env_path.exists():
@@ -13,3 +16,11 @@ if env_path.exists():
 def pytest_configure(config):
     """Register custom markers."""
     config.addinivalue_line("markers", "integration: mark test as integration test (requires API key)")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_provider_cache():
+    """Keep memoized yfinance responses from leaking between tests."""
+    clear_provider_cache()
+    yield
+    clear_provider_cache()
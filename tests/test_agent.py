@@ -41,3 +41,461 @@ def test_no_deadloop_on_many_tickers_prompt() -> None:
     output = agent.run(query=query, tickers=["A", "B", "C", "D", "E"], period="3mo")
     assert len(output["tool_calls"]) <= 6
     assert validate_schema("final_output", output)[0]
+
+
+def test_tool_calls_keep_submission_order() -> None:
+    agent = ResearchAgent(offline=True, use_llm=False)
+    output = agent.run(query="compare", tickers=["AAPL", "MSFT", "SPY"], period="3mo")
+    assert output["data_used"] == [
+        "fundamentals_events:AAPL",
+        "market_snapshot:AAPL",
+        "fundamentals_events:MSFT",
+        "market_snapshot:MSFT",
+        "fundamentals_events:SPY",
+        "market_snapshot:SPY",
+    ]
+    assert [call["args"]["ticker"] for call in output["tool_calls"]] == [
+        "AAPL", "AAPL", "MSFT", "MSFT", "SPY", "SPY",
+    ]
+
+
+def test_tool_call_args_use_json_lists() -> None:
+    agent = ResearchAgent(offline=True, use_llm=False)
+    output = agent.run(query="trend", tickers=["AAPL"], period="3mo")
+    args = {call["name"]: call["args"] for call in output["tool_calls"]}
+    assert args["market_snapshot"]["benchmarks"] == []
+    assert args["fundamentals_events"]["fields"] == []
+
+
+def test_json_safe_converts_dates_and_reuses_plain_payloads() -> None:
+    from datetime import date
+
+    from react_investment_research.agent import _json_safe
+
+    plain = {"AAPL": {"market_snapshot": {"prices": {"start": 1.0}, "notes": []}}}
+    assert _json_safe(plain) is plain
+
+    dated = {"AAPL": {"calendar": {"Earnings Date": [date(2026, 1, 30)]}}}
+    assert _json_safe(dated) == {"AAPL": {"calendar": {"Earnings Date": ["2026-01-30"]}}}
+    assert isinstance(dated["AAPL"]["calendar"]["Earnings Date"][0], date)
+
+
+def test_call_tool_validates_invalid_payload_once(monkeypatch) -> None:
+    calls = []
+
+    def bad_snapshot(**kwargs):
+        calls.append(kwargs)
+        return {"unexpected": True}
+
+    monkeypatch.setattr("react_investment_research.mocks.market_snapshot", bad_snapshot)
+    agent = ResearchAgent(offline=True)
+    limitations = []
+    payload = agent._call_tool("market_snapshot", {"ticker": "AAPL", "period": "3mo"}, [], limitations)
+    assert len(calls) == 1
+    assert payload["error"] == "INVALID_OUTPUT"
+    assert limitations and limitations[0].startswith("market_snapshot output invalid")
+
+
+def test_call_tool_invokes_successful_tool_once(monkeypatch) -> None:
+    from react_investment_research import mocks
+
+    real_snapshot = mocks.market_snapshot
+    calls = []
+
+    def counting_snapshot(**kwargs):
+        calls.append(kwargs)
+        return real_snapshot(**kwargs)
+
+    monkeypatch.setattr("react_investment_research.mocks.market_snapshot", counting_snapshot)
+    agent = ResearchAgent(offline=True)
+    payload = agent._call_tool("market_snapshot", {"ticker": "AAPL", "period": "3mo"}, [], [])
+    assert len(calls) == 1
+    assert "error" not in payload
+
+
+def test_call_tool_reports_error_after_second_raise(monkeypatch) -> None:
+    attempts = []
+
+    def broken_snapshot(**kwargs):
+        attempts.append(kwargs)
+        raise ConnectionError("reset by peer")
+
+    monkeypatch.setattr("react_investment_research.mocks.market_snapshot", broken_snapshot)
+    agent = ResearchAgent(offline=True)
+    limitations = []
+    payload = agent._call_tool("market_snapshot", {"ticker": "AAPL", "period": "3mo"}, [], limitations)
+    assert len(attempts) == 2
+    assert payload == {"error": "TOOL_ERROR", "ticker": "AAPL", "reason": "reset by peer"}
+    assert limitations == ["market_snapshot failed: reset by peer"]
+
+
+def test_call_tool_retries_raised_errors_once(monkeypatch) -> None:
+    from react_investment_research import mocks
+
+    real_snapshot = mocks.market_snapshot
+    attempts = []
+
+    def flaky_snapshot(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise ConnectionError("reset by peer")
+        return real_snapshot(**kwargs)
+
+    monkeypatch.setattr("react_investment_research.mocks.market_snapshot", flaky_snapshot)
+    agent = ResearchAgent(offline=True)
+    payload = agent._call_tool("market_snapshot", {"ticker": "AAPL", "period": "3mo"}, [], [])
+    assert len(attempts) == 2
+    assert payload["ticker"] == "AAPL"
+    assert "error" not in payload
+
+
+def test_schema_validators_are_reused() -> None:
+    from react_investment_research.schemas import get_validator
+
+    assert get_validator("market_snapshot") is get_validator("market_snapshot")
+
+
+def test_tool_payloads_validate_against_the_matching_branch() -> None:
+    from react_investment_research.schemas import get_branch_validators, validate_schema
+
+    assert get_branch_validators("market_snapshot") is not None
+    assert get_branch_validators("fundamentals_events") is not None
+    assert get_branch_validators("final_output") is None
+
+    assert validate_schema("market_snapshot", {"error": "NO_DATA", "ticker": "X", "reason": "r"}) == (True, None)
+    ok, message = validate_schema("market_snapshot", {"error": "NO_DATA", "ticker": "X"})
+    assert not ok and "'reason' is a required property" in message
+    ok, message = validate_schema("fundamentals_events", {"ticker": "X", "asof": "", "fundamentals": {}, "calendar": {}})
+    assert not ok and "'flags' is a required property" in message
+
+
+def test_every_registered_schema_is_well_formed() -> None:
+    from react_investment_research.schemas import SCHEMAS, get_validator
+
+    for name in SCHEMAS:
+        assert get_validator(name).schema is SCHEMAS[name]
+
+
+def test_summarize_snapshot_risk_precedence() -> None:
+    agent = ResearchAgent(offline=True)
+    snapshot = {
+        "period": "3mo",
+        "trend": {"trend_label": "bearish"},
+        "prices": {"return_pct": -25.0, "max_drawdown_pct": -30.0},
+        "risk": {"volatility_ann_pct": 55.0},
+    }
+    thesis, risk = agent._summarize_snapshot("XYZ", snapshot)
+    assert thesis == "XYZ: bearish trend, return -25.00% over 3mo"
+    assert risk == "XYZ: large drawdown (-30.0%)"
+
+    snapshot["prices"]["max_drawdown_pct"] = -5.0
+    assert agent._summarize_snapshot("XYZ", snapshot)[1] == "XYZ: high volatility (55.0%)"
+
+    snapshot["risk"]["volatility_ann_pct"] = 10.0
+    assert agent._summarize_snapshot("XYZ", snapshot)[1] is None
+
+
+def test_validate_tickers_partitions_in_order() -> None:
+    class StubProvider:
+        def get_info(self, ticker):
+            if ticker == "BOOM":
+                raise RuntimeError("network down")
+            return {"symbol": ticker} if ticker != "NOPE" else {}
+
+    from react_investment_research import agent as agent_module
+
+    agent_module._VALIDATED_TICKERS.clear()
+    agent = ResearchAgent(offline=True)
+    agent.provider = StubProvider()
+    valid, invalid = agent._validate_tickers(["NVDA", "NOPE", "AMD", "BOOM"])
+    assert valid == ["NVDA", "AMD"]
+    assert invalid == ["NOPE", "BOOM"]
+    assert agent._validate_tickers([]) == ([], [])
+
+
+def test_validate_tickers_caches_only_valid_results() -> None:
+    from react_investment_research import agent as agent_module
+
+    probed = []
+
+    class CountingProvider:
+        def get_info(self, ticker):
+            probed.append(ticker)
+            return {"symbol": ticker} if ticker == "NVDA" else {}
+
+    agent_module._VALIDATED_TICKERS.clear()
+    agent = ResearchAgent(offline=True)
+    agent.provider = CountingProvider()
+    assert agent._validate_tickers(["NVDA", "NOPE"]) == (["NVDA"], ["NOPE"])
+    assert ResearchAgent(offline=True)._validate_tickers(["NVDA"]) == (["NVDA"], [])
+    agent._validate_tickers(["NOPE"])
+    assert sorted(probed) == ["NOPE", "NOPE", "NVDA"]
+    agent_module._VALIDATED_TICKERS.clear()
+
+
+def test_validated_tickers_expire_and_are_probed_again(monkeypatch) -> None:
+    from react_investment_research import agent as agent_module
+    from react_investment_research.cache import MemoryCache
+
+    now = [0.0]
+    probed = []
+
+    class CountingProvider:
+        def get_info(self, ticker):
+            probed.append(ticker)
+            return {"symbol": ticker}
+
+    monkeypatch.setattr(agent_module, "_VALIDATED_TICKERS", MemoryCache(8, 60, clock=lambda: now[0]))
+    agent = ResearchAgent(offline=True)
+    agent.provider = CountingProvider()
+    agent._validate_tickers(["NVDA"])
+    agent._validate_tickers(["NVDA"])
+    now[0] = 61.0
+    agent._validate_tickers(["NVDA"])
+    assert probed == ["NVDA", "NVDA"]
+
+
+def test_final_output_schema_does_not_revalidate_tool_payloads() -> None:
+    agent = ResearchAgent(offline=True)
+    output = agent.run(query="trend", tickers=["AAPL"], period="3mo")
+    output["tool_returns"]["AAPL"]["market_snapshot"] = {"not": "a snapshot"}
+    ok, error = validate_schema("final_output", output)
+    assert ok, error
+
+
+def test_normalize_ticker_returns_shared_uppercase_string() -> None:
+    from react_investment_research.agent import _normalize_ticker
+
+    first = _normalize_ticker("".join(["n", "vda"]))
+    second = _normalize_ticker("nvda")
+    assert first == "NVDA"
+    assert first is second
+
+
+def test_agent_uses_slots() -> None:
+    agent = ResearchAgent(offline=True)
+    assert not hasattr(agent, "__dict__")
+
+
+def test_validate_tickers_prefers_batch_provider() -> None:
+    from react_investment_research import agent as agent_module
+
+    class BatchProvider:
+        def __init__(self):
+            self.batches = []
+
+        def get_quotes_batch(self, tickers):
+            self.batches.append(list(tickers))
+            return {t: ({"symbol": t} if t != "NOPE" else {}) for t in tickers}
+
+        def get_info(self, ticker):
+            raise AssertionError("per-ticker probe should not run")
+
+    agent_module._VALIDATED_TICKERS.clear()
+    agent = ResearchAgent(offline=True)
+    agent.provider = BatchProvider()
+    assert agent._validate_tickers(["NVDA", "NOPE"]) == (["NVDA"], ["NOPE"])
+    assert agent.provider.batches == [["NVDA", "NOPE"]]
+    agent_module._VALIDATED_TICKERS.clear()
+
+
+def test_tool_dispatch_is_derived_from_registry() -> None:
+    from react_investment_research import mocks
+
+    online = ResearchAgent(offline=False, use_llm=False, use_cache=False)
+    offline = ResearchAgent(offline=True)
+    handlers = {name: tool.handler for name, tool in online._full_registry.get_all().items()}
+    assert online._tool_dispatch == handlers
+    assert offline._tool_dispatch == {name: getattr(mocks, name) for name in handlers}
+
+
+def test_json_safe_handles_deep_nesting_without_recursion() -> None:
+    from datetime import date
+
+    from react_investment_research.agent import _json_safe
+
+    nested = leaf = {}
+    for _ in range(5000):
+        leaf["child"] = leaf = {}
+    leaf["when"] = [date(2026, 1, 30), 1, [date(2026, 2, 1)]]
+    converted = _json_safe(nested)
+    node = converted
+    for _ in range(5000):
+        node = node["child"]
+    assert node["when"] == ["2026-01-30", 1, ["2026-02-01"]]
+
+
+def test_explicit_duplicate_tickers_are_called_once() -> None:
+    agent = ResearchAgent(offline=True, use_llm=False)
+    output = agent.run("compare", tickers=["aapl", "AAPL", "", "msft", "Aapl"], period="1mo")
+    assert output["tickers"] == ["AAPL", "MSFT"]
+    called = [(call["name"], call["args"]["ticker"]) for call in output["tool_calls"]]
+    assert len(called) == len(set(called))
+
+
+def test_post_process_derives_sections_in_one_pass() -> None:
+    from react_investment_research.agent import TickerResult
+
+    agent = ResearchAgent(offline=True, use_llm=False)
+    failed = {"error": "NO_DATA", "ticker": "MSFT", "reason": "empty"}
+    results = {
+        "MSFT": TickerResult("MSFT", {"fundamentals_events": failed}, fundamentals_events=failed),
+    }
+    limitations = []
+    processed = agent._post_process(results, limitations)
+    assert processed.fundamentals == {"MSFT": {}}
+    assert processed.data_used == [("fundamentals_events", "MSFT")]
+    assert processed.snapshots == {} and processed.thesis_bullets == []
+    assert limitations == ["MSFT: fundamentals unavailable"]
+
+
+def test_validate_tickers_rejects_malformed_symbols_without_probing() -> None:
+    from react_investment_research import agent as agent_module
+
+    probed = []
+
+    class StubProvider:
+        def get_info(self, ticker):
+            probed.append(ticker)
+            return {"symbol": ticker}
+
+    agent_module._VALIDATED_TICKERS.clear()
+    agent = ResearchAgent(offline=True)
+    agent.provider = StubProvider()
+    candidates = ["MY STOCK", "BRK.B", "APPLEINC", "^GSPC", "BTC-USD", "GC=F"]
+    valid, invalid = agent._validate_tickers(candidates)
+    assert valid == ["BRK.B", "^GSPC", "BTC-USD", "GC=F"]
+    assert invalid == ["MY STOCK", "APPLEINC"]
+    assert sorted(probed) == sorted(valid)
+    agent_module._VALIDATED_TICKERS.clear()
+
+
+def test_precheck_applies_guards_before_any_tool_work() -> None:
+    agent = ResearchAgent(offline=True, use_llm=False)
+    tickers, period, limitations, early = agent._precheck(
+        "compare", ["a", "b", "c", "d", "e", "f", "a"], "10y"
+    )
+    assert tickers == ["A", "B", "C", "D", "E"]
+    assert period == "3mo"
+    assert limitations == [
+        "Invalid period provided. Using default 3mo.",
+        "Too many tickers provided. Truncating to max allowed.",
+    ]
+    assert early is None
+
+
+def test_blank_query_without_tickers_returns_before_calling_tools() -> None:
+    agent = ResearchAgent(offline=True)
+    output = agent.run("   ", tickers=[], period="bad")
+    assert output["tool_calls"] == []
+    assert output["limitations"][-1] == "Empty query and no tickers provided. Nothing to research."
+    assert "Invalid period provided. Using default 3mo." in output["limitations"]
+
+
+def test_mock_payloads_are_read_once_and_returned_as_fresh_dicts() -> None:
+    from react_investment_research import mocks
+
+    mocks._read_mock.cache_clear()
+    first = mocks.market_snapshot("AAPL", "3mo")
+    first["prices"]["end"] = -1.0
+    second = mocks.market_snapshot("AAPL", "3mo")
+
+    assert second["prices"]["end"] == 195.0
+    assert mocks._read_mock.cache_info().hits == 1
+
+
+def test_ticker_budget_follows_max_tool_calls_set_after_init() -> None:
+    agent = ResearchAgent(offline=True, use_llm=False)
+    agent.max_tool_calls = 2
+    output = agent.run(query="compare", tickers=["AAPL", "MSFT"], period="3mo")
+    assert "Tool budget exceeded. Skipping some tickers." in output["limitations"]
+    assert {call["args"]["ticker"] for call in output["tool_calls"]} == {"AAPL"}
+
+
+def test_cached_llm_summary_is_not_tracked_as_a_query(monkeypatch) -> None:
+    from react_investment_research import agent as agent_module
+
+    tracked = []
+
+    class RecordingAnalyzer:
+        def track_query(self, **kwargs):
+            tracked.append(kwargs)
+
+    class CachedSummaryLLM:
+        enabled = True
+
+        def decide_tools(self, query, tickers, tools_description):
+            return {"tools": [{"tool": "market_snapshot", "tickers": tickers}]}
+
+        def generate_summary(self, query, tickers, tool_outputs, on_item=None):
+            return {
+                "thesis_bullets": ["cached"],
+                "risks": [],
+                "llm_tokens": {"input": 0, "cached_input": 0, "output": 0, "total": 0},
+                "llm_cached": True,
+            }
+
+    monkeypatch.setattr(agent_module, "get_global_analyzer", RecordingAnalyzer)
+    agent = ResearchAgent(offline=True)
+    agent.use_llm = agent.track_costs = True
+    agent.llm = CachedSummaryLLM()
+    output = agent.run(query="trend", tickers=["AAPL"], period="3mo")
+
+    assert output["summary"]["thesis_bullets"] == ["cached"]
+    assert output["cost_analysis"] is None
+    assert tracked == []
+
+
+def test_run_forwards_streamed_summary_items() -> None:
+    class StreamingLLM:
+        enabled = True
+
+        def decide_tools(self, query, tickers, tools_description):
+            return {"tools": [{"tool": "market_snapshot", "tickers": tickers}]}
+
+        def generate_summary(self, query, tickers, tool_outputs, on_item=None):
+            on_item("thesis_bullets", "AAPL: streamed")
+            return {"thesis_bullets": ["AAPL: streamed"], "risks": []}
+
+    agent = ResearchAgent(offline=True)
+    agent.use_llm = True
+    agent.llm = StreamingLLM()
+    items = []
+    output = agent.run(query="trend", tickers=["AAPL"], on_summary_item=lambda field, text: items.append((field, text)))
+
+    assert items == [("thesis_bullets", "AAPL: streamed")]
+    assert output["summary"]["thesis_bullets"] == ["AAPL: streamed"]
+
+
+def test_run_batch_summarizes_all_requests_in_one_batch() -> None:
+    batches = []
+
+    class BatchLLM:
+        enabled = True
+
+        def decide_tools(self, query, tickers, tools_description):
+            return {"tools": [{"tool": "market_snapshot", "tickers": tickers}]}
+
+        def generate_summary_batch(self, jobs, poll_interval=None, timeout=None):
+            batches.append(([(query, tickers) for query, tickers, _ in jobs], poll_interval, timeout))
+            return [{"thesis_bullets": [f"{query}: batched"], "risks": [], "llm_batch": True} for query, _, _ in jobs]
+
+    agent = ResearchAgent(offline=True)
+    agent.use_llm = True
+    agent.llm = BatchLLM()
+    outputs = agent.run_batch(
+        [
+            {"query": "trend", "tickers": ["AAPL"]},
+            {"query": "", "tickers": []},
+            {"query": "compare", "tickers": ["MSFT"], "period": "6mo"},
+        ],
+        poll_interval=5,
+        timeout=60,
+    )
+
+    assert batches == [([("trend", ["AAPL"]), ("compare", ["MSFT"])], 5, 60)]
+    assert [output["summary"]["thesis_bullets"] for output in outputs] == [
+        ["trend: batched"], [], ["compare: batched"],
+    ]
+    assert "Empty query and no tickers provided. Nothing to research." in outputs[1]["limitations"]
+    assert all(validate_schema("final_output", output)[0] for output in outputs)
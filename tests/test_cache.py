@@ -0,0 +1,135 @@
+from datetime import date
+
+from react_investment_research.agent import ResearchAgent
+from react_investment_research.cache import FileCache, MemoryCache, SemanticCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_file_cache_roundtrip_and_expiry(tmp_path) -> None:
+    clock = FakeClock()
+    cache = FileCache(tmp_path, ttl_seconds={"market_snapshot": 60}, clock=clock)
+    args = {"ticker": "AAPL", "period": "3mo"}
+
+    assert cache.get("market_snapshot", args) is None
+    cache.set("market_snapshot", args, {"ticker": "AAPL", "asof": date(2026, 1, 30)})
+    assert cache.get("market_snapshot", args) == {"ticker": "AAPL", "asof": "2026-01-30"}
+    assert cache.get("market_snapshot", {"ticker": "MSFT", "period": "3mo"}) is None
+
+    clock.now += 61
+    assert cache.get("market_snapshot", args) is None
+
+
+def test_file_cache_skips_namespaces_without_ttl(tmp_path) -> None:
+    cache = FileCache(tmp_path, ttl_seconds={})
+    cache.set("market_snapshot", {"ticker": "AAPL"}, {"ticker": "AAPL"})
+    assert cache.get("market_snapshot", {"ticker": "AAPL"}) is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_file_cache_ignores_unserializable_payload(tmp_path) -> None:
+    cache = FileCache(tmp_path)
+    cache.set("market_snapshot", {"ticker": "AAPL"}, {"ticker": object()})
+    assert cache.get("market_snapshot", {"ticker": "AAPL"}) is None
+
+
+def test_agent_serves_repeat_tool_calls_from_cache(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RESEARCH_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def fake_fundamentals(**kwargs):
+        calls.append(kwargs)
+        return {"ticker": kwargs["ticker"], "asof": "", "fundamentals": {}, "calendar": {}, "flags": []}
+
+    agent = ResearchAgent(offline=False, use_llm=False, use_cache=True)
+    agent._tool_dispatch = {"fundamentals_events": fake_fundamentals}
+    args = {"ticker": "AAPL", "fields": [], "include_calendar": True, "lookback_days": 90}
+    limitations = []
+
+    first = agent._call_tool("fundamentals_events", args, [], [])
+    second = agent._call_tool("fundamentals_events", args, [], limitations)
+    assert first == second
+    assert len(calls) == 1
+    assert limitations == ["fundamentals_events for AAPL: served from on-disk cache"]
+
+
+def test_agent_refetches_cached_payload_that_fails_schema(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RESEARCH_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def fake_fundamentals(**kwargs):
+        calls.append(kwargs)
+        return {"ticker": kwargs["ticker"], "asof": "", "fundamentals": {}, "calendar": {}, "flags": []}
+
+    agent = ResearchAgent(offline=False, use_llm=False, use_cache=True)
+    agent._tool_dispatch = {"fundamentals_events": fake_fundamentals}
+    args = {"ticker": "AAPL", "fields": [], "include_calendar": True, "lookback_days": 90}
+    agent.cache.set("fundamentals_events", args, {"ticker": "AAPL", "stale_field": 1})
+
+    limitations = []
+    payload = agent._call_tool("fundamentals_events", args, [], limitations)
+    assert payload["fundamentals"] == {}
+    assert len(calls) == 1
+    assert limitations == []
+
+
+def test_live_agent_does_not_cache_by_default() -> None:
+    assert ResearchAgent(offline=False, use_llm=False).cache is None
+
+
+def test_offline_agent_has_no_cache() -> None:
+    assert ResearchAgent(offline=True).cache is None
+
+
+def test_semantic_cache_matches_paraphrases_within_namespace() -> None:
+    vectors = {
+        "NVDA outlook": [1.0, 0.0, 0.1],
+        "thesis on Nvidia": [0.98, 0.0, 0.15],
+        "bond yields": [0.0, 1.0, 0.0],
+    }
+    cache = SemanticCache(lambda text: vectors[text], threshold=0.92)
+    namespace = ("summary", "openai", ("NVDA",), "data")
+
+    cache.store(namespace, cache.embed("NVDA outlook"), {"tickers": ["NVDA"]})
+
+    assert cache.lookup(namespace, cache.embed("thesis on Nvidia")) == {"tickers": ["NVDA"]}
+    assert cache.lookup(namespace, cache.embed("bond yields")) is None
+    assert cache.lookup(("summary", "openai"), cache.embed("thesis on Nvidia")) is None
+
+
+def test_semantic_cache_embed_failure_is_a_miss_and_size_is_bounded() -> None:
+    def embed(text: str) -> list[float]:
+        if text == "boom":
+            raise RuntimeError("embedding service down")
+        return [float(len(text)), 1.0]
+
+    cache = SemanticCache(embed, threshold=0.9999, maxsize=2)
+    namespace = ("summary", "openai", ("NVDA",), "data")
+    assert cache.embed("boom") is None
+    assert cache.lookup(namespace, None) is None
+
+    for text in ("a", "bbbbbbbbbb", "cccccccccccccccccccc"):
+        cache.store(namespace, cache.embed(text), text)
+    assert cache.lookup(namespace, cache.embed("a")) is None
+    assert cache.lookup(namespace, cache.embed("cccccccccccccccccccc")) == "cccccccccccccccccccc"
+
+
+def test_memory_cache_evicts_lru_and_expires_entries() -> None:
+    now = [0.0]
+    cache = MemoryCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.get("c") is None
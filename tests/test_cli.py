@@ -29,3 +29,35 @@ def test_cli_period_validation(capsys):
         captured = capsys.readouterr()
         output = json.loads(captured.out)
         assert "Invalid period" in output["limitations"][0]
+
+
+def test_write_json_streams_compact_output_with_dates():
+    import io
+    from datetime import date
+
+    from react_investment_research.cli import write_json
+
+    stream = io.StringIO()
+    write_json({"when": date(2026, 1, 30), "values": [1, 2]}, stream)
+    assert stream.getvalue() == '{"when":"2026-01-30","values":[1,2]}\n'
+
+
+def testparse_csv_strips_once_and_drops_blanks():
+    from react_investment_research.cli import parse_csv
+
+    assert parse_csv(" aapl, ,MSFT ,,") == ["aapl", "MSFT"]
+    assert parse_csv("") == []
+
+
+def test_cli_batch_writes_one_line_per_request(tmp_path, capsys):
+    batch_file = tmp_path / "queries.jsonl"
+    batch_file.write_text(
+        '{"query": "trend", "tickers": ["aapl"]}\n\n{"query": "compare", "tickers": "MSFT,SPY", "period": "6mo"}\n'
+    )
+    with patch("sys.argv", ["prog", "--offline", "--batch", str(batch_file)]):
+        main()
+    lines = capsys.readouterr().out.splitlines()
+    outputs = [json.loads(line) for line in lines]
+    assert [output["query"] for output in outputs] == ["trend", "compare"]
+    assert outputs[0]["tickers"] == ["AAPL"]
+    assert outputs[1]["tickers"] == ["MSFT", "SPY"]
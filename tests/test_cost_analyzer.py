@@ -30,6 +30,15 @@ class TestTokenCount:
         assert tc.total == 150
 
 
+    def test_token_count_is_immutable_and_slotted(self) -> None:
+        """Test token counts are frozen records without a per-instance dict."""
+        tc = TokenCount(input_tokens=1, output_tokens=2)
+        assert not hasattr(tc, "__dict__")
+        assert hash(tc) == hash(TokenCount(input_tokens=1, output_tokens=2))
+        with pytest.raises(AttributeError):
+            tc.input_tokens = 5
+
+
 class TestCostBreakdown:
     """Test cost breakdown calculation."""
 
@@ -92,6 +101,29 @@ class TestCostAnalyzer:
         assert pytest.approx(cost.output_cost_usd, abs=0.000001) == expected_output
         assert pytest.approx(cost.total_usd, abs=0.000001) == expected_total
 
+    def test_calculate_cost_falls_back_to_provider_default(self) -> None:
+        """Test unknown models use the provider default and unknown providers are free."""
+        analyzer = CostAnalyzer()
+        default = analyzer.calculate_cost("anthropic", "claude-3-5-sonnet-20241022", 1000, 250)
+        unknown = analyzer.calculate_cost("anthropic", "claude-unreleased", 1000, 250)
+        assert unknown == default
+        assert analyzer.calculate_cost("other", "model", 1000, 250).total_usd == 0.0
+
+    def test_cached_input_tokens_bill_at_cached_rate(self) -> None:
+        """Test prompt-cache hits are charged at the discounted input rate."""
+        analyzer = CostAnalyzer()
+        cost = analyzer.calculate_cost(
+            "anthropic", "claude-3-5-sonnet-20241022", 2000, 100, cached_input_tokens=1500
+        )
+        expected_input = (500 / 1_000_000) * 3.00 + (1500 / 1_000_000) * 0.30
+        assert pytest.approx(cost.input_cost_usd, abs=1e-9) == expected_input
+
+        uncached_model = analyzer.calculate_cost("openai", "gpt-4-turbo", 1000, 0, cached_input_tokens=400)
+        assert uncached_model == analyzer.calculate_cost("openai", "gpt-4-turbo", 1000, 0)
+
+        analysis = analyzer.track_query("q", ["A"], "3mo", "openai", "gpt-4o-mini", 1000, 100, 800)
+        assert analysis.to_dict()["tokens"]["cached_input"] == 800
+
     def test_track_query(self) -> None:
         """Test query tracking."""
         analyzer = CostAnalyzer()
@@ -111,6 +143,14 @@ class TestCostAnalyzer:
         assert analysis.tokens.input_tokens == 1000
         assert analysis.tokens.output_tokens == 250
 
+    def test_track_query_interns_labels(self) -> None:
+        """Test repeated labels share one string object across records."""
+        analyzer = CostAnalyzer()
+        first = analyzer.track_query("q1", ["".join(["AA", "PL"])], "3mo", "openai", "gpt-4o-mini", 10, 1)
+        second = analyzer.track_query("q2", ["".join(["AAP", "L"])], "3mo", "openai", "gpt-4o-mini", 10, 1)
+        assert first.tickers[0] is second.tickers[0]
+        assert first.model is second.model
+
     def test_query_cost_per_ticker(self) -> None:
         """Test cost per ticker calculation."""
         analyzer = CostAnalyzer()
@@ -190,6 +230,18 @@ class TestCostAnalyzer:
         assert summary["avg_cost_per_query"] > 0
         assert summary["avg_tokens_per_query"] == 1600
 
+    def test_session_summary_omits_queries_by_default(self) -> None:
+        """Test the default totals-only summary skips per-query serialization."""
+        analyzer = CostAnalyzer()
+        assert "queries" not in analyzer.get_session_summary()
+        analyzer.track_query("query1", ["A"], "3mo", "openai", "gpt-4o-mini", 1000, 250)
+
+        totals = analyzer.get_session_summary()
+        full = analyzer.get_session_summary(include_queries=True)
+        assert "queries" not in totals
+        assert len(full.pop("queries")) == 1
+        assert totals == full
+
     def test_provider_breakdown(self) -> None:
         """Test provider cost breakdown."""
         analyzer = CostAnalyzer()
@@ -210,6 +262,25 @@ class TestCostAnalyzer:
         assert breakdown["openai"]["queries"] == 1
         assert breakdown["anthropic"]["queries"] == 1
 
+    def test_running_totals_match_tracked_queries(self) -> None:
+        """Test summaries are served from running totals without drift."""
+        analyzer = CostAnalyzer()
+        analyzer.track_query("q1", ["A"], "3mo", "openai", "gpt-4o-mini", 1000, 250)
+        analyzer.track_query("q2", ["B"], "3mo", "openai", "gpt-4-turbo", 500, 100)
+        analyzer.track_query("q3", ["C"], "3mo", "openai", "gpt-4o-mini", 700, 50)
+
+        first = analyzer.get_provider_breakdown()
+        assert analyzer.get_provider_breakdown() == first
+        openai = first["openai"]
+        assert openai["queries"] == 3
+        assert openai["total_tokens"] == sum(q.tokens.total for q in analyzer.queries)
+        assert openai["models"]["gpt-4o-mini"]["queries"] == 2
+        assert openai["total_cost_usd"] == round(sum(q.cost.total_usd for q in analyzer.queries), 6)
+
+        summary = analyzer.get_session_summary()
+        assert summary["total_tokens"] == 2600
+        assert summary["total_cost_usd"] == openai["total_cost_usd"]
+
     def test_cost_comparison(self) -> None:
         """Test provider comparison."""
         analyzer = CostAnalyzer()
@@ -249,6 +320,29 @@ class TestBatchAnalyze:
         assert result["total_queries"] == 3
         assert result["avg_cost_per_query"] > 0
 
+    def test_batch_analyze_matches_per_query_tracking(self) -> None:
+        """Test vectorized batch totals equal tracking each estimated query."""
+        queries = [("q1", ["A"], "3mo"), ("q2", [], None), ("q3", ["B", "C", "D"], "1y")]
+        result = batch_analyze(queries, provider="anthropic")
+
+        analyzer = CostAnalyzer()
+        for text, tickers, period in queries:
+            n = len(tickers) if tickers else 1
+            analyzer.track_query(
+                text, tickers, period or "3mo", "anthropic", "claude-3-5-sonnet-20241022",
+                800 + (n - 1) * 400, 250 + (n - 1) * 50,
+            )
+        summary = analyzer.get_session_summary()
+        assert result["total_tokens"] == summary["total_tokens"]
+        assert result["total_cost_usd"] == summary["total_cost_usd"]
+
+    def test_batch_analyze_empty(self) -> None:
+        """Test batch analysis with no queries."""
+        result = batch_analyze([], provider="openai")
+        assert result["total_tokens"] == 0
+        assert result["total_cost_usd"] == 0.0
+        assert result["avg_cost_per_query"] == 0
+
     def test_batch_analyze_anthropic(self) -> None:
         """Test batch analysis with Anthropic provider."""
         queries = [("query", ["TICKER"], "3mo")]
@@ -309,3 +403,19 @@ class TestQueryCostAnalysisToDict:
         assert "tokens" in result
         assert "cost" in result
         assert result["cost"]["total_usd"] > 0
+
+    def test_analysis_to_dict_returns_independent_copies(self) -> None:
+        """Test editing a rendered dict never changes the stored record."""
+        analyzer = CostAnalyzer()
+        analysis = analyzer.track_query("q", ["A"], "3mo", "openai", "gpt-4o-mini", 1000, 250)
+
+        first = analysis.to_dict()
+        first["tickers"].append("B")
+        first["cost"]["total_usd"] = -1.0
+        first["tokens"]["input"] = 0
+
+        assert analysis.tickers == ["A"]
+        assert analysis.to_dict()["tickers"] == ["A"]
+        summary = analyzer.get_session_summary(include_queries=True)
+        assert summary["queries"][0]["cost"]["total_usd"] > 0
+        assert summary["queries"][0]["tokens"]["input"] == 1000
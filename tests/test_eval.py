@@ -17,3 +17,22 @@ def test_eval_results_valid_json():
         assert "tickers" in res
         assert "summary" in res
         assert "disclaimer" in res
+
+
+def test_eval_results_keep_case_order():
+    result = run_eval()
+    assert [res["query"] for res in result["results"]] == [
+        "trend summary for AAPL",
+        "compare AAPL vs MSFT",
+        "risk evaluation",
+        "macro proxies",
+    ]
+
+
+def test_eval_clears_provider_cache_per_case(monkeypatch):
+    from react_investment_research import eval as eval_module
+
+    clears = []
+    monkeypatch.setattr(eval_module, "clear_provider_cache", lambda: clears.append(1))
+    run_eval()
+    assert len(clears) == 4
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import MagicMock
 
 from react_investment_research.llm import LLMClient
@@ -24,3 +25,540 @@ def test_llm_infer_tickers_disabled(monkeypatch):
     result = client.infer_tickers("compare Nvidia vs AMD")
     assert "tickers" in result
     assert result.get("llm_error")
+
+
+def test_llm_plan_research_disabled(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = LLMClient()
+    result = client.plan_research("compare Nvidia vs AMD", "- market_snapshot: prices")
+    assert result["tickers"] == []
+    assert result["tools"] == []
+    assert result.get("llm_error")
+
+
+def test_llm_parse_plan_response_cleans_tool_names():
+    client = LLMClient()
+    plan = client._parse_plan_response(
+        '{"tickers": ["NVDA"], "tools": [{"tool": "sentiment_analysis [PAID] $0.05/call", "tickers": ["NVDA"]}]}'
+    )
+    assert plan["tickers"] == ["NVDA"]
+    assert plan["tools"] == [{"tool": "sentiment_analysis", "tickers": ["NVDA"]}]
+
+
+def test_summary_prompt_keeps_instructions_in_stable_prefix():
+    client = LLMClient()
+    prefix_a, suffix_a = client._summary_prompt("q1", ["AAPL"], {"AAPL": {"x": 1}})
+    prefix_b, suffix_b = client._summary_prompt("q2", ["MSFT"], {"MSFT": {"x": 2}})
+    assert prefix_a == prefix_b
+    assert "q1" in suffix_a and "AAPL" in suffix_a
+    assert "q1" not in prefix_a
+
+
+def test_decide_tools_prompt_prefix_independent_of_query():
+    client = LLMClient()
+    tools_desc = "- market_snapshot: Fetch technical analysis"
+    prefix_a, suffix_a = client._decide_tools_prompt("trend?", ["NVDA"], tools_desc)
+    prefix_b, _ = client._decide_tools_prompt("risk?", ["AAPL", "MSFT"], tools_desc)
+    assert prefix_a == prefix_b
+    assert tools_desc in prefix_a
+    assert "NVDA" in suffix_a
+
+
+def test_anthropic_request_marks_prefix_for_caching(monkeypatch):
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    response = MagicMock()
+    response.content = [MagicMock(text='{"tickers": ["NVDA"]}')]
+    response.usage.input_tokens = 10
+    response.usage.output_tokens = 2
+    fake_sdk.Anthropic.return_value.messages.create.return_value = response
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    result = client._anthropic_infer_tickers("Nvidia outlook")
+
+    assert result["tickers"] == ["NVDA"]
+    kwargs = fake_sdk.Anthropic.return_value.messages.create.call_args.kwargs
+    assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert kwargs["messages"] == [
+        {"role": "user", "content": "User Query: Nvidia outlook"},
+        {"role": "assistant", "content": "{"},
+    ]
+
+
+def test_usage_helpers_report_cached_input_tokens():
+    from types import SimpleNamespace
+
+    from react_investment_research.llm import _anthropic_usage, _openai_usage
+
+    openai_message = SimpleNamespace(usage=SimpleNamespace(
+        prompt_tokens=1200,
+        completion_tokens=50,
+        total_tokens=1250,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    ))
+    assert _openai_usage(openai_message) == {"input": 1200, "cached_input": 1024, "output": 50, "total": 1250}
+
+    anthropic_message = SimpleNamespace(usage=SimpleNamespace(
+        input_tokens=100,
+        output_tokens=40,
+        cache_read_input_tokens=1000,
+        cache_creation_input_tokens=0,
+    ))
+    assert _anthropic_usage(anthropic_message) == {
+        "input": 1100,
+        "cached_input": 1000,
+        "output": 40,
+        "total": 1140,
+    }
+
+
+def test_sdk_client_is_created_once_and_reused(monkeypatch):
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    response = MagicMock()
+    response.content = [MagicMock(text='{"tickers": []}')]
+    response.usage.input_tokens = 1
+    response.usage.output_tokens = 1
+    fake_sdk.Anthropic.return_value.messages.create.return_value = response
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    client._anthropic_infer_tickers("first")
+    client._anthropic_infer_tickers("second")
+
+    assert fake_sdk.Anthropic.call_count == 1
+    assert fake_sdk.Anthropic.return_value.messages.create.call_count == 2
+
+
+def test_summary_prompt_embeds_compact_json():
+    client = LLMClient()
+    _, suffix = client._summary_prompt("q", ["AAPL"], {"snapshots": {"AAPL": {"return_pct": 1.5}}})
+    assert '{"snapshots":{"AAPL":{"return_pct":1.5}}}' in suffix
+
+
+def test_summary_prompt_prunes_metadata_and_empty_fields():
+    client = LLMClient()
+    tool_outputs = {
+        "snapshots": {
+            "AAPL": {
+                "ticker": "AAPL",
+                "asof": "2026-01-31",
+                "interval": "1d",
+                "prices": {"return_pct": 8.33},
+                "relative": [],
+                "notes": [f"note {i}" for i in range(8)],
+            },
+            "ZZZZ": {"error": "NO_DATA", "ticker": "ZZZZ", "reason": "x" * 500},
+        },
+        "fundamentals": {"AAPL": {"ticker": "AAPL", "fundamentals": {"trailingPE": 25.1, "pegRatio": None}}},
+    }
+    _, suffix = client._summary_prompt("q", ["AAPL"], tool_outputs)
+    data = json.loads(suffix.split("Market Data:\n", 1)[1].split("\n", 1)[0])
+
+    assert data["snapshots"]["AAPL"] == {
+        "prices": {"return_pct": 8.33},
+        "notes": ["note 3", "note 4", "note 5", "note 6", "note 7"],
+    }
+    assert data["snapshots"]["ZZZZ"]["error"] == "NO_DATA"
+    assert data["snapshots"]["ZZZZ"]["reason"] == "x" * 200 + "...(truncated)"
+    assert data["fundamentals"]["AAPL"] == {"fundamentals": {"trailingPE": 25.1}}
+
+
+def test_importing_llm_does_not_import_provider_sdks():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, react_investment_research.llm; "
+        "print('openai' in sys.modules, 'anthropic' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_sdk_client_is_shared_across_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: client._anthropic_client(), range(32)))
+
+    assert fake_sdk.Anthropic.call_count == 1
+    assert all(c is clients[0] for c in clients)
+
+
+def test_repeated_prompt_is_served_from_response_cache(monkeypatch):
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    response = MagicMock()
+    response.content = [MagicMock(text='{"tickers": ["NVDA"]}')]
+    response.usage.input_tokens = 10
+    response.usage.output_tokens = 2
+    fake_sdk.Anthropic.return_value.messages.create.return_value = response
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    first = client._anthropic_infer_tickers("Nvidia outlook")
+    second = client._anthropic_infer_tickers("Nvidia outlook")
+
+    assert fake_sdk.Anthropic.return_value.messages.create.call_count == 1
+    assert second["tickers"] == first["tickers"] == ["NVDA"]
+    assert second["llm_cached"] is True
+    assert second["llm_tokens"]["total"] == 0
+
+
+def _semantic_openai_client(monkeypatch, embeddings, content):
+    import json as json_module
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("RESEARCH_SEMANTIC_CACHE", "1")
+    fake_openai = MagicMock()
+    sdk_client = fake_openai.return_value
+    sdk_client.embeddings.create.side_effect = lambda model, input: SimpleNamespace(
+        data=[SimpleNamespace(embedding=embeddings[input])]
+    )
+    sdk_client.chat.completions.create.return_value = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json_module.dumps(content)))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=2, total_tokens=12),
+    )
+    monkeypatch.setattr(llm_module, "OpenAI", fake_openai)
+    return sdk_client
+
+
+def test_semantic_cache_answers_paraphrased_summaries_over_same_data(monkeypatch):
+    embeddings = {"Nvidia outlook": [1.0, 0.0], "thesis on Nvidia": [0.99, 0.05]}
+    summary = {"thesis_bullets": ["NVDA: uptrend"], "risks": []}
+    sdk_client = _semantic_openai_client(monkeypatch, embeddings, summary)
+    data = {"snapshots": {"NVDA": {"trend": "up"}}, "fundamentals": {}}
+
+    client = LLMClient()
+    first = client.generate_summary("Nvidia outlook", ["NVDA"], data)
+    second = client.generate_summary("thesis on Nvidia", ["NVDA"], data)
+    other_data = client.generate_summary("thesis on Nvidia", ["NVDA"], {**data, "fundamentals": {"NVDA": {}}})
+
+    assert sdk_client.chat.completions.create.call_count == 2
+    assert first["thesis_bullets"] == second["thesis_bullets"] == ["NVDA: uptrend"]
+    assert second["llm_cached"] is True
+    assert "llm_cached" not in other_data
+
+
+def test_semantic_cache_does_not_answer_ticker_inference(monkeypatch):
+    # Queries differing only in the company embed close together
+    embeddings = {"Is Nvidia overvalued?": [1.0, 0.0], "Is Broadcom overvalued?": [0.99, 0.05]}
+    sdk_client = _semantic_openai_client(monkeypatch, embeddings, {"tickers": ["NVDA"], "tools": []})
+
+    client = LLMClient()
+    client.plan_research("Is Nvidia overvalued?", "- market_snapshot: prices")
+    client.plan_research("Is Broadcom overvalued?", "- market_snapshot: prices")
+
+    assert sdk_client.chat.completions.create.call_count == 2
+    sdk_client.embeddings.create.assert_not_called()
+
+
+def test_generate_summary_batch_anthropic_returns_results_in_job_order(monkeypatch):
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    fake_sdk = MagicMock()
+    batches = fake_sdk.Anthropic.return_value.messages.batches
+    batches.create.return_value = SimpleNamespace(id="b1", processing_status="in_progress")
+    batches.retrieve.return_value = SimpleNamespace(id="b1", processing_status="ended")
+    message = SimpleNamespace(
+        content=[SimpleNamespace(text='{"thesis_bullets": ["up"], "risks": []}')],
+        usage=SimpleNamespace(input_tokens=50, output_tokens=10),
+    )
+    batches.results.return_value = [
+        SimpleNamespace(custom_id="sum-1", result=SimpleNamespace(type="errored")),
+        SimpleNamespace(custom_id="sum-0", result=SimpleNamespace(type="succeeded", message=message)),
+    ]
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    results = client.generate_summary_batch(
+        [("q1", ["AAPL"], {"a": 1}), ("q2", ["MSFT"], {"b": 2})], poll_interval=0
+    )
+
+    requests = batches.create.call_args.kwargs["requests"]
+    assert [r["custom_id"] for r in requests] == ["sum-0", "sum-1"]
+    assert requests[0]["params"]["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert results[0]["thesis_bullets"] == ["up"]
+    assert results[0]["llm_batch"] is True
+    assert results[0]["llm_tokens"]["total"] == 60
+    assert "llm_error" in results[1]
+
+
+def test_generate_summary_batch_cancels_after_timeout(monkeypatch):
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    fake_sdk = MagicMock()
+    batches = fake_sdk.Anthropic.return_value.messages.batches
+    batches.create.return_value = SimpleNamespace(id="b1", processing_status="in_progress")
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    results = LLMClient().generate_summary_batch([("q1", ["AAPL"], {})], poll_interval=0, timeout=0)
+
+    batches.cancel.assert_called_once_with("b1")
+    batches.results.assert_not_called()
+    assert "did not finish in time" in results[0]["llm_error"]
+
+
+def test_generate_summary_batch_openai_uploads_jsonl(monkeypatch):
+    import json as json_module
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    fake_openai = MagicMock()
+    sdk_client = fake_openai.return_value
+    sdk_client.files.create.return_value = SimpleNamespace(id="file-in")
+    sdk_client.batches.create.return_value = SimpleNamespace(id="batch-1", status="completed", output_file_id="file-out")
+    body = {
+        "choices": [{"message": {"content": '{"thesis_bullets": ["flat"], "risks": ["rates"]}'}}],
+        "usage": {"prompt_tokens": 40, "completion_tokens": 8, "total_tokens": 48},
+    }
+    output = json_module.dumps({"custom_id": "sum-0", "response": {"status_code": 200, "body": body}})
+    sdk_client.files.content.return_value = SimpleNamespace(text=output + "\n")
+    monkeypatch.setattr(llm_module, "OpenAI", fake_openai)
+
+    client = LLMClient()
+    results = client.generate_summary_batch([("q", ["SPY"], {})], poll_interval=0)
+
+    filename, payload = sdk_client.files.create.call_args.kwargs["file"]
+    request = json_module.loads(payload.decode("utf-8"))
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["prompt_cache_key"] == "react_investment_research_v1"
+    assert sdk_client.batches.create.call_args.kwargs["completion_window"] == "24h"
+    assert results == [{
+        "thesis_bullets": ["flat"],
+        "risks": ["rates"],
+        "llm_tokens": {"input": 40, "cached_input": 0, "output": 8, "total": 48},
+        "llm_provider": "openai",
+        "llm_model": "gpt-4o-mini",
+        "llm_batch": True,
+    }]
+
+
+def test_summary_item_parser_reports_items_as_they_close():
+    from react_investment_research.llm import _SummaryItemParser
+
+    parser = _SummaryItemParser()
+    text = '{"thesis_bullets": ["Up 5% \\"YTD\\"", "Above SMA-50"], "note": "x", "risks": ["Rates, [high]"]}'
+    seen = []
+    for i in range(0, len(text), 7):
+        seen.extend(parser.feed(text[i:i + 7]))
+
+    assert seen == [
+        ("thesis_bullets", 'Up 5% "YTD"'),
+        ("thesis_bullets", "Above SMA-50"),
+        ("risks", "Rates, [high]"),
+    ]
+
+
+def test_generate_summary_streams_items_from_anthropic(monkeypatch):
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    # The reply continues the prefilled "{"
+    full = '"thesis_bullets": ["Strong trend"], "risks": ["High beta"]}'
+    stream = MagicMock()
+    stream.__enter__.return_value = stream
+    stream.text_stream = [full[:20], full[20:45], full[45:]]
+    stream.get_final_message.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text=full)],
+        usage=SimpleNamespace(input_tokens=30, output_tokens=12),
+    )
+    fake_sdk = MagicMock()
+    fake_sdk.Anthropic.return_value.messages.stream.return_value = stream
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    items = []
+    result = client.generate_summary("q", ["NVDA"], {}, on_item=lambda field, text: items.append((field, text)))
+
+    assert items == [("thesis_bullets", "Strong trend"), ("risks", "High beta")]
+    assert result["thesis_bullets"] == ["Strong trend"]
+    assert result["llm_tokens"]["total"] == 42
+
+    # A cached answer was not streamed, so it is only returned
+    repeat_items = []
+    repeat = client.generate_summary("q", ["NVDA"], {}, on_item=lambda field, text: repeat_items.append(field))
+    assert repeat["llm_cached"] is True
+    assert repeat["thesis_bullets"] == ["Strong trend"]
+    assert repeat_items == []
+
+
+def test_api_key_is_read_once_at_init(monkeypatch):
+    from react_investment_research import llm as llm_module
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-first")
+    fake_sdk = MagicMock()
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-second")
+    client._anthropic_client()
+
+    assert fake_sdk.Anthropic.call_args.kwargs["api_key"] == "sk-ant-first"
+
+
+def test_clean_tool_decisions_strips_tags_and_prices():
+    from react_investment_research.llm import _clean_tool_decisions
+
+    tools = [
+        {"tool": "sentiment_analysis [PAID] $0.05/call", "tickers": ["NVDA"]},
+        {"tool": "[FREE] market_snapshot"},
+        "not-a-dict",
+    ]
+    assert _clean_tool_decisions(tools) == [
+        {"tool": "sentiment_analysis", "tickers": ["NVDA"]},
+        {"tool": "market_snapshot"},
+        "not-a-dict",
+    ]
+    assert _clean_tool_decisions("nope") == []
+
+
+def test_anthropic_reply_continues_prefilled_brace(monkeypatch):
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    fake_sdk.Anthropic.return_value.messages.create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text='"tickers": ["AMD"]}')],
+        usage=SimpleNamespace(input_tokens=5, output_tokens=3),
+    )
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    assert LLMClient()._anthropic_infer_tickers("AMD outlook")["tickers"] == ["AMD"]
+
+
+def test_explicit_tickers_skip_the_model_call(monkeypatch):
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+
+    client = LLMClient()
+    assert client.infer_tickers("compare NVDA vs AMD, then NVDA again") == {"tickers": ["NVDA", "AMD"]}
+    assert client.plan_research("Is now a good time for SPY?", "- market_snapshot: prices") == {
+        "tickers": ["SPY"],
+        "tools": [],
+    }
+    fake_sdk.Anthropic.return_value.messages.create.assert_not_called()
+
+
+def test_explicit_tickers_defer_to_the_model_on_unknown_names():
+    from react_investment_research.llm import _explicit_tickers
+
+    assert _explicit_tickers("Should I buy GS or MS?") == []
+    assert _explicit_tickers("Compare NVDA with Broadcom") == []
+    assert _explicit_tickers("WHY IS MY HEATING COST SO LOW?") == []
+    assert _explicit_tickers("Is IT a good time for SPY?") == []
+    assert _explicit_tickers("How is AAPL doing? Compare it to MSFT.") == ["AAPL", "MSFT"]
+
+
+def test_ticker_extraction_uses_the_extract_model(monkeypatch):
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    fake_sdk.Anthropic.return_value.messages.create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text='"tickers": ["NVDA"]}')],
+        usage=SimpleNamespace(input_tokens=5, output_tokens=3),
+    )
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    client.models["anthropic"]["extract"] = "claude-test-small"
+    result = client._anthropic_infer_tickers("what about Nvidia?")
+
+    assert fake_sdk.Anthropic.return_value.messages.create.call_args.kwargs["model"] == "claude-test-small"
+    assert result["llm_model"] == "claude-test-small"
+
+
+def test_plan_research_uses_the_extract_model(monkeypatch):
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    fake_sdk = MagicMock()
+    fake_sdk.Anthropic.return_value.messages.create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text='"tickers": ["AVGO"], "tools": []}')],
+        usage=SimpleNamespace(input_tokens=5, output_tokens=3),
+    )
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+
+    client = LLMClient()
+    client.models["anthropic"]["extract"] = "claude-test-small"
+    result = client.plan_research("Compare NVDA with Broadcom", "- market_snapshot: prices")
+
+    assert fake_sdk.Anthropic.return_value.messages.create.call_args.kwargs["model"] == "claude-test-small"
+    assert result["tickers"] == ["AVGO"]
+
+
+def test_concurrent_identical_prompts_share_one_request(monkeypatch):
+    import threading
+    import time
+    from types import SimpleNamespace
+
+    from react_investment_research import llm as llm_module
+
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_create(**kwargs):
+        entered.set()
+        release.wait(timeout=5)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text='"tickers": ["NVDA"]}')],
+            usage=SimpleNamespace(input_tokens=5, output_tokens=3),
+        )
+
+    fake_sdk = MagicMock()
+    fake_sdk.Anthropic.return_value.messages.create.side_effect = slow_create
+    monkeypatch.setattr(llm_module, "anthropic", fake_sdk)
+
+    client = LLMClient()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client._anthropic_infer_tickers("Nvidia?")))]
+    threads[0].start()
+    entered.wait(timeout=5)
+    threads.append(threading.Thread(target=lambda: results.append(client._anthropic_infer_tickers("Nvidia?"))))
+    threads[1].start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert fake_sdk.Anthropic.return_value.messages.create.call_count == 1
+    assert [result["tickers"] for result in results] == [["NVDA"], ["NVDA"]]
+    assert sorted(result.get("llm_cached", False) for result in results) == [False, True]
@@ -33,3 +33,68 @@ def test_market_snapshot_with_benchmarks():
     assert "error" not in result
     assert result["ticker"] == "AAPL"
     assert result["period"] == "3mo"
+
+
+def test_market_snapshot_short_history_reports_zero_volatility():
+    dates = pd.date_range("2026-01-01", periods=2, freq="D")
+    df = pd.DataFrame(
+        {
+            "High": [101.0, 103.0],
+            "Low": [99.0, 100.0],
+            "Close": [100.0, 102.0],
+            "Volume": [1000.0, 1200.0],
+        },
+        index=dates,
+    )
+
+    class FakeProvider:
+        def get_ohlcv(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+            return df
+
+    result = market_snapshot("AAPL", "5d", provider=FakeProvider())
+    assert result["risk"]["volatility_ann_pct"] == 0.0
+    assert result["risk"]["atr_14"] == 2.5
+    assert result["trend"]["sma_20"] == 101.0
+
+
+def test_market_snapshot_coerces_non_float_columns_and_multi_ticker_frames():
+    dates = pd.date_range("2026-01-01", periods=3, freq="D")
+    df = pd.DataFrame(
+        {
+            ("High", "AAPL"): [101.0, 102.0, 103.0],
+            ("Low", "AAPL"): [99.0, 100.0, 101.0],
+            ("Close", "AAPL"): ["100", "101", "bad"],
+            ("Volume", "AAPL"): [1000, 1100, 1200],
+        },
+        index=dates,
+    )
+
+    class FakeProvider:
+        def get_ohlcv(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+            return df
+
+    result = market_snapshot("AAPL", "5d", provider=FakeProvider())
+    assert result["prices"]["start"] == 100.0
+    assert result["prices"]["end"] == 101.0
+    assert result["volume"]["latest"] == 1200.0
+
+
+def test_market_snapshot_fetches_benchmarks_concurrently_in_order():
+    import threading
+
+    dates = pd.date_range("2026-01-01", periods=30, freq="D")
+    prices = pd.Series(range(100, 130), index=dates, dtype=float)
+    df = pd.DataFrame({"High": prices + 1, "Low": prices - 1, "Close": prices, "Volume": prices * 10})
+    # Every fetch blocks until all three are in flight, so a serial loop would time out
+    barrier = threading.Barrier(3, timeout=5)
+
+    class FakeProvider:
+        def get_ohlcv(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+            barrier.wait()
+            if ticker == "BAD":
+                raise RuntimeError("no data")
+            return df
+
+    result = market_snapshot("AAPL", "3mo", benchmarks=["BAD", "SPY"], provider=FakeProvider())
+    assert "error" not in result
+    assert [row["ticker"] for row in result["relative"]] == ["SPY"]
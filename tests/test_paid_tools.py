@@ -81,3 +81,12 @@ class TestToolSelection:
             # Free tools should have 0 pricing
             if not info["is_paid"]:
                 assert info["pricing_usd_per_call"] == 0.0
+
+
+def test_full_registry_shared_across_agents():
+    """Full registry is built once and reused by every agent."""
+    first = ResearchAgent(offline=True)
+    second = ResearchAgent(offline=True, available_tools=["sentiment_analysis"])
+    assert first._full_registry is second._full_registry
+    assert first.registry.list_names() == ["fundamentals_events", "market_snapshot"]
+    assert second.registry.list_names() == ["sentiment_analysis"]
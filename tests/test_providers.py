@@ -25,3 +25,59 @@ def test_provider_get_info_empty(monkeypatch):
     provider = YFinanceProvider()
     result = provider.get_info("INVALID")
     assert result == {}
+
+
+def test_provider_get_quotes_batch(monkeypatch):
+    dates = pd.date_range("2026-01-01", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([["AAPL", "ZZZZ"], ["Close", "Volume"]])
+    data = pd.DataFrame(
+        [[100.0, 1.0, None, None], [101.0, 1.0, None, None], [102.0, 1.0, None, None]],
+        index=dates,
+        columns=columns,
+    )
+    requested = []
+
+    def mock_download(tickers, **kwargs):
+        requested.append(tickers)
+        return data
+
+    monkeypatch.setattr("yfinance.download", mock_download)
+    provider = YFinanceProvider()
+    quotes = provider.get_quotes_batch(["AAPL", "ZZZZ", "MISSING"])
+    assert requested == [["AAPL", "ZZZZ", "MISSING"]]
+    assert quotes == {"AAPL": {"symbol": "AAPL", "close": 102.0}, "ZZZZ": {}, "MISSING": {}}
+
+
+def test_provider_memoizes_downloads_across_instances(monkeypatch):
+    dates = pd.date_range("2026-01-01", periods=2, freq="D")
+    frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=dates)
+    calls = []
+
+    def mock_download(ticker, **kwargs):
+        calls.append(ticker)
+        return frame
+
+    monkeypatch.setattr("yfinance.download", mock_download)
+    first = YFinanceProvider().get_ohlcv("SPY", "3mo", "1d")
+    first.loc[dates[0], "Close"] = -1.0
+    second = YFinanceProvider().get_ohlcv("SPY", "3mo", "1d")
+    YFinanceProvider().get_ohlcv("SPY", "1y", "1d")
+
+    assert calls == ["SPY", "SPY"]
+    assert second["Close"].tolist() == [1.0, 2.0]
+
+
+def test_provider_does_not_memoize_empty_info(monkeypatch):
+    responses = [None, {"symbol": "AAPL"}]
+
+    def mock_ticker(*args, **kwargs):
+        class MockTicker:
+            info = responses.pop(0)
+
+        return MockTicker()
+
+    monkeypatch.setattr("yfinance.Ticker", mock_ticker)
+    assert YFinanceProvider().get_info("AAPL") == {}
+    assert YFinanceProvider().get_info("AAPL") == {"symbol": "AAPL"}
+    assert YFinanceProvider().get_info("AAPL") == {"symbol": "AAPL"}
+    assert responses == []
@@ -41,6 +41,40 @@ class TestTool:
         assert tool.is_paid is True
         assert tool.pricing_usd_per_call == 0.05
 
+    def test_tool_is_immutable_and_slotted(self):
+        """Registered tool specs cannot be changed in place."""
+        import dataclasses
+
+        tool = Tool(
+            name="test_tool",
+            handler=dummy_handler,
+            input_schema={"type": "object"},
+            output_schema={"type": "object"},
+            description="A test tool",
+        )
+        assert not hasattr(tool, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            tool.budget_per_ticker = 2
+        assert dataclasses.replace(tool, budget_per_ticker=2).budget_per_ticker == 2
+
+    def test_tool_prompt_description_is_rendered_once(self):
+        """The prompt line is built at creation and follows replace()."""
+        import dataclasses
+
+        tool = Tool(
+            name="sentiment_analysis",
+            handler=dummy_handler,
+            input_schema={"type": "object"},
+            output_schema={"type": "object"},
+            description="News sentiment",
+            is_paid=True,
+            pricing_usd_per_call=0.05,
+        )
+        assert tool.to_prompt_description() is tool.to_prompt_description()
+        assert tool.to_prompt_description() == "- sentiment_analysis [PAID]: News sentiment\n  Example usage: None"
+        renamed = dataclasses.replace(tool, name="news")
+        assert renamed.to_prompt_description().startswith("- news [PAID]:")
+
     def test_tool_creation_paid_requires_pricing(self):
         """Test that paid tools must have pricing > 0."""
         with pytest.raises(ValueError, match="pricing_usd_per_call"):
@@ -300,6 +334,21 @@ class TestToolRegistry:
         assert "A test tool" in description
         assert "example query" in description
 
+    def test_registry_prompt_description_refreshes_after_register(self):
+        """Test cached prompt description is rebuilt when a tool is added."""
+        registry = ToolRegistry()
+        assert registry.to_prompt_description() == "No tools available"
+        registry.register(Tool(
+            name="late_tool",
+            handler=dummy_handler,
+            input_schema={"type": "object"},
+            output_schema={"type": "object"},
+            description="Registered after first render",
+        ))
+        first = registry.to_prompt_description()
+        assert "late_tool" in first
+        assert registry.to_prompt_description() is first
+
     def test_registry_repr(self):
         """Test string representation of registry."""
         registry = ToolRegistry()
@@ -416,6 +465,14 @@ class TestToolRegistry:
         filtered = registry.create_filtered_registry(["tool1"])
         assert filtered.list_names() == ["tool1"]
         assert filtered.get("tool2") is None
+        assert filtered.get_total_budget_per_ticker() == 1
+
+        duplicated = registry.create_filtered_registry(["tool2", "tool1", "tool2"])
+        assert duplicated.list_names() == ["tool1", "tool2"]
+        assert duplicated.get_total_budget_per_ticker() == 2
+        names = duplicated.list_names()
+        names.append("mutated")
+        assert duplicated.list_names() == ["tool1", "tool2"]
 
     def test_registry_create_filtered_registry_invalid_tool(self):
         """Test filtered registry rejects invalid tools."""
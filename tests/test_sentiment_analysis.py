@@ -108,3 +108,16 @@ class TestSentimentAnalysis:
         # TLT should have negative sentiment
         tlt_result = sentiment_analysis("TLT")
         assert tlt_result["overall_sentiment"] < 0.0  # Bearish
+
+
+def test_importing_sentiment_tool_does_not_import_requests():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, react_investment_research.mocks as mocks; "
+        "mocks.sentiment_analysis('NVDA'); "
+        "print('requests' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False"]
@@ -0,0 +1,51 @@
+import pytest
+
+from react_investment_research.repl import _parse_line
+from react_investment_research.server import clear_agents, get_agent
+
+
+def test_get_agent_reuses_instance_per_configuration() -> None:
+    clear_agents()
+    first = get_agent(offline=True, available_tools=["market_snapshot", "fundamentals_events"])
+    again = get_agent(offline=True, available_tools=("fundamentals_events", "market_snapshot"))
+    assert first is again
+    assert get_agent(offline=True) is not first
+    clear_agents()
+    assert get_agent(offline=True, available_tools=["market_snapshot", "fundamentals_events"]) is not first
+
+
+def test_get_agent_rejects_unknown_tools_every_time() -> None:
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            get_agent(offline=True, available_tools=["no_such_tool"])
+
+
+def test_repl_parses_optional_tickers_and_period() -> None:
+    assert _parse_line("trend for AAPL") == ("trend for AAPL", [], "3mo")
+    assert _parse_line("compare | aapl, msft | 6mo") == ("compare", ["AAPL", "MSFT"], "6mo")
+
+
+def test_repl_prints_streamed_summary_items_before_the_result(monkeypatch, capsys) -> None:
+    from react_investment_research import repl
+
+    class StreamingAgent:
+        def run(self, query, tickers, period, on_summary_item=None):
+            on_summary_item("thesis_bullets", "AAPL: uptrend")
+            on_summary_item("risks", "AAPL: high volatility")
+            return {"query": query}
+
+    lines = iter(["trend | AAPL"])
+
+    def fake_input(prompt):
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError
+
+    monkeypatch.setattr(repl, "get_agent", lambda **kwargs: StreamingAgent())
+    monkeypatch.setattr("builtins.input", fake_input)
+    repl.main([])
+
+    captured = capsys.readouterr()
+    assert captured.err == "  thesis: AAPL: uptrend\n  risk: AAPL: high volatility\n"
+    assert captured.out == '{"query":"trend"}\n'
@@ -2,6 +2,7 @@
 
 import json
 import os
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -79,6 +80,17 @@ class TestLLMDecideTools:
         assert len(result["tools"]) == 1
         assert result["tools"][0]["tickers"] == []
 
+    def test_generate_tool_decision_example_strips_paid_tags_and_prices(self):
+        """Tool names drop [PAID]/[FREE] tags and per-call prices; example lines are ignored."""
+        llm = LLMClient()
+        tools_desc = """- sentiment_analysis [PAID] $0.05/call: News sentiment
+  Example usage: sentiment: bullish?
+- market_snapshot [FREE]: Fetch technical analysis"""
+        example = llm._generate_tool_decision_example(tools_desc, ["NVDA"])
+
+        result = json.loads(example)
+        assert [tool["tool"] for tool in result["tools"]] == ["sentiment_analysis", "market_snapshot"]
+
     def test_generate_tool_decision_example_no_tools(self):
         """Test dynamic example generation when no tools found."""
         llm = LLMClient()
@@ -269,3 +281,84 @@ class TestAgentOfflineSchema:
         deserialized = json.loads(json_str)
         assert deserialized["query"] == "test"
         assert deserialized["tickers"] == ["NVDA"]
+
+
+class TestPlannedToolRouting:
+    """Tests for reusing tool decisions from the batched plan call."""
+
+    def test_planned_tools_skip_decide_tools(self):
+        """Planned routing is executed without a second LLM routing call."""
+        agent = ResearchAgent(offline=True)
+        agent.llm = MagicMock()
+
+        tool_calls = []
+        limitations = []
+        results = agent._decide_and_call_tools_llm(
+            "trend for aapl",
+            ["AAPL"],
+            "3mo",
+            tool_calls,
+            limitations,
+            planned_tools=[{"tool": "market_snapshot", "tickers": ["aapl", "MSFT"]}],
+        )
+
+        agent.llm.decide_tools.assert_not_called()
+        assert list(results) == ["AAPL"]
+        assert results["AAPL"].snapshot is not None
+        assert list(results["AAPL"].tool_returns) == ["market_snapshot"]
+        assert [call["name"] for call in tool_calls] == ["market_snapshot"]
+
+    def test_stale_plan_falls_back_to_decide_tools(self):
+        """Plans naming none of the final tickers trigger a fresh routing call."""
+        agent = ResearchAgent(offline=True)
+        agent.llm = MagicMock()
+        agent.llm.decide_tools.return_value = {"tools": []}
+
+        agent._decide_and_call_tools_llm(
+            "macro",
+            ["SPY", "QQQ"],
+            "3mo",
+            [],
+            [],
+            planned_tools=[{"tool": "market_snapshot", "tickers": ["ZZZZ"]}],
+        )
+
+        agent.llm.decide_tools.assert_called_once()
+
+    def test_single_tool_registry_skips_routing_call(self):
+        """With one available tool there is nothing for the LLM to route."""
+        agent = ResearchAgent(offline=True, available_tools=["market_snapshot"])
+        agent.llm = MagicMock()
+
+        tool_calls = []
+        agent._decide_and_call_tools_llm("compare", ["AAPL", "MSFT"], "3mo", tool_calls, [])
+
+        agent.llm.decide_tools.assert_not_called()
+        assert [(c["name"], c["args"]["ticker"]) for c in tool_calls] == [
+            ("market_snapshot", "AAPL"),
+            ("market_snapshot", "MSFT"),
+        ]
+
+    def test_single_ticker_free_tools_skip_routing_call(self):
+        """One ticker with only free tools calls them all without routing."""
+        agent = ResearchAgent(offline=True)
+        agent.llm = MagicMock()
+
+        tool_calls = []
+        agent._decide_and_call_tools_llm("trend", ["AAPL"], "3mo", tool_calls, [])
+
+        agent.llm.decide_tools.assert_not_called()
+        assert sorted(c["name"] for c in tool_calls) == ["fundamentals_events", "market_snapshot"]
+
+    def test_single_ticker_with_paid_tool_still_routes(self):
+        """A paid tool in the registry keeps the LLM deciding whether to use it."""
+        agent = ResearchAgent(
+            offline=True,
+            available_tools=["market_snapshot", "fundamentals_events", "sentiment_analysis"],
+        )
+        agent.llm = MagicMock()
+        agent.llm.decide_tools.return_value = {"tools": []}
+
+        agent._decide_and_call_tools_llm("trend", ["AAPL"], "3mo", [], [])
+
+        agent.llm.decide_tools.assert_called_once()